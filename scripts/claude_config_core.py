@@ -0,0 +1,574 @@
+"""
+Core of the Claude MCP configuration generator.
+
+Loads config.yaml, decrypts secrets and builds the mcpServers
+configuration. scripts/generate-claude-config.py is the command-line
+entry point; this module is kept fully typed so that it can optionally be
+compiled with mypyc (see `make compile`).
+"""
+
+import functools
+import hashlib
+import json
+import os
+import re
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+# orjson is optional; it serializes several times faster than the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+MCP_HUB_DIR = Path(__file__).parent.parent
+CONFIG_FILE = MCP_HUB_DIR / "config.yaml"
+# config.yaml parsed to JSON, so unchanged configs load without PyYAML
+CONFIG_JSON = MCP_HUB_DIR / "generated" / "config.json"
+OUTPUT_FILE = MCP_HUB_DIR / "generated" / "claude-mcp-servers.json"
+# sha256 of the OUTPUT_FILE contents last written
+OUTPUT_HASH_FILE = MCP_HUB_DIR / "generated" / ".mcp-servers.sha256"
+
+# sops inputs, resolved once; subprocess and the environment want strings
+_AGE_KEY_FILE = Path.home() / ".config" / "sops" / "age" / "keys.txt"
+_SOPS_CONFIG = MCP_HUB_DIR / "secrets" / ".sops.yaml"
+_AGE_KEY_STR = str(_AGE_KEY_FILE)
+_SOPS_CONFIG_STR = str(_SOPS_CONFIG)
+
+# Decrypted secrets, keyed by the sha256 of the ciphertext they came from
+SECRETS_CACHE_DIR = MCP_HUB_DIR / "generated" / ".secrets-cache"
+
+# Hashes of the inputs of the last successful run
+SNAPSHOT_FILE = MCP_HUB_DIR / "generated" / ".config-snapshot.json"
+
+# Secrets files this process failed to decrypt. A config generated without
+# their secrets must not be snapshotted, or fixing sops or the age key
+# would leave the next run reporting "No changes".
+_DECRYPT_FAILURES: set[str] = set()
+
+# Matches ${VAR} and ${VAR:-default}
+_PLACEHOLDER = re.compile(r"\A\$\{([^:}]+)(?::-(.*))?\}\Z")
+
+# Finds the variable names referenced anywhere in config.yaml
+_PLACEHOLDER_NAME = re.compile(rb"\$\{([^:}]+)")
+
+# Environment for sops, built once rather than copied per secrets file
+_SOPS_ENV = {
+    **os.environ,
+    "SOPS_AGE_KEY_FILE": _AGE_KEY_STR,
+}
+
+# Upper bound on concurrent sops processes when decrypting secrets files
+MAX_DECRYPT_WORKERS = 8
+
+# Upper bound on servers whose configs are built concurrently
+MAX_BUILD_WORKERS = 8
+
+
+def dumps(obj: dict[str, Any]) -> bytes:
+    """Serialize obj as 2-space indented JSON bytes.
+
+    Values JSON can't represent are written as their str().
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson.JSONEncodeError, e.g. for integers beyond 64 bits, which
+            # ~/.claude.json may hold and the stdlib encoder accepts
+            pass
+    return json.dumps(obj, indent=2, default=str).encode()
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _yaml_load(data: bytes) -> Any:
+    """Parse YAML, importing PyYAML only when it is actually needed."""
+    import yaml
+
+    # Prefer the libyaml-backed loader; fall back to pure Python if unavailable
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(data, Loader=loader)
+
+
+def load_config() -> dict[str, Any]:
+    """Load the master config.yaml.
+
+    Parsing YAML is much slower than parsing JSON, so the result is kept
+    in CONFIG_JSON and reused for as long as it is not older than config.yaml.
+    """
+    try:
+        if CONFIG_JSON.stat().st_mtime_ns >= CONFIG_FILE.stat().st_mtime_ns:
+            config: dict[str, Any] = _loads(CONFIG_JSON.read_bytes())
+            return config
+    except (OSError, ValueError):
+        pass  # Missing or corrupt - fall back to YAML
+
+    config = _yaml_load(CONFIG_FILE.read_bytes())
+    write_config_json(config)
+    return config
+
+
+def write_config_json(config: dict[str, Any]) -> None:
+    """Write the parsed config to CONFIG_JSON, if JSON can represent it."""
+    data = dumps(config)
+    if _loads(data) != config:
+        return  # e.g. dates or non-string keys; keep reading the YAML
+    CONFIG_JSON.parent.mkdir(parents=True, exist_ok=True)
+    _write_atomic(CONFIG_JSON, data, 0o644)
+
+
+def _ciphertext_digest(path: Path) -> str:
+    """Return the sha256 hex digest of an encrypted secrets file."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes, mode: int = 0o600) -> None:
+    """Write data to path via a temporary file and an atomic rename."""
+    tmp_file = path.with_name(f"{path.name}.tmp")
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_file, path)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+
+def _write_secrets_cache(cache_file: Path, secrets: dict[str, Any]) -> None:
+    """Write decrypted secrets to the cache, readable only by the owner."""
+    SECRETS_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    _write_atomic(cache_file, json.dumps(secrets).encode())
+
+
+def purge_secrets_cache(secrets_files: list[str]) -> None:
+    """Remove cached secrets that no longer match a current ciphertext."""
+    if not SECRETS_CACHE_DIR.exists():
+        return
+
+    live = {
+        f"{_ciphertext_digest(path)}.json"
+        for path in (MCP_HUB_DIR / f for f in secrets_files)
+        if path.exists()
+    }
+    for cache_file in SECRETS_CACHE_DIR.iterdir():
+        if cache_file.name not in live:
+            cache_file.unlink(missing_ok=True)
+
+
+def _secrets_files(servers: dict[str, dict[str, Any]]) -> list[str]:
+    """Return the distinct secrets files used by enabled servers."""
+    return sorted({
+        server["secrets_file"]
+        for server in servers.values()
+        if server.get("enabled", True) and "secrets_file" in server
+    })
+
+
+def _snapshot(config_data: bytes, secrets_files: list[str]) -> dict[str, Any]:
+    """Hash everything the generated config depends on."""
+    # Placeholders not found in secrets fall back to the environment
+    environ = {
+        name: os.environ.get(name)
+        for name in sorted({m.decode() for m in _PLACEHOLDER_NAME.findall(config_data)})
+    }
+    secrets: dict[str, str | None] = {}
+    for secrets_file in secrets_files:
+        path = MCP_HUB_DIR / secrets_file
+        secrets[secrets_file] = _ciphertext_digest(path) if path.exists() else None
+
+    return {
+        "generator": hashlib.sha256(Path(__file__).read_bytes()).hexdigest(),
+        "config": hashlib.sha256(config_data).hexdigest(),
+        "environ": hashlib.sha256(json.dumps(environ).encode()).hexdigest(),
+        "secrets": secrets,
+    }
+
+
+def is_up_to_date() -> bool:
+    """Check whether config.yaml and its secrets are unchanged since the last run."""
+    if not OUTPUT_FILE.exists() or not SNAPSHOT_FILE.exists():
+        return False
+    try:
+        previous = json.loads(SNAPSHOT_FILE.read_bytes())
+        current = _snapshot(CONFIG_FILE.read_bytes(), list(previous["secrets"]))
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+    return current == previous
+
+
+def take_snapshot(config: dict[str, Any]) -> dict[str, Any]:
+    """Hash the inputs of a run, before generating from them."""
+    return _snapshot(CONFIG_FILE.read_bytes(), _secrets_files(config.get("servers", {})))
+
+
+def write_snapshot(snapshot: dict[str, Any]) -> None:
+    """Record the inputs of a successful run for is_up_to_date()."""
+    _write_atomic(SNAPSHOT_FILE, dumps(snapshot))
+
+
+def clear_snapshot() -> None:
+    """Forget the last run's inputs, so the next run regenerates."""
+    SNAPSHOT_FILE.unlink(missing_ok=True)
+
+
+def decryption_failed() -> bool:
+    """Check whether any secrets file could not be decrypted this run."""
+    return bool(_DECRYPT_FAILURES)
+
+
+def decrypt_secrets(secrets_file: str) -> dict[str, Any]:
+    """Decrypt a SOPS-encrypted secrets file and return as dict.
+
+    Results are memoized per (file, mtime) for the current process and
+    cached on disk by ciphertext hash, so unchanged files skip sops.
+    """
+    secrets_path = MCP_HUB_DIR / secrets_file
+
+    if not secrets_path.exists():
+        print(f"  Warning: Secrets file not found: {secrets_file}")
+        return {}
+
+    return _decrypt_cached(secrets_file, secrets_path.stat().st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=None)
+def _decrypt_cached(secrets_file: str, mtime_ns: int) -> dict[str, Any]:
+    """Decrypt a secrets file, consulting the on-disk cache first."""
+    secrets_path = MCP_HUB_DIR / secrets_file
+    cache_file = SECRETS_CACHE_DIR / f"{_ciphertext_digest(secrets_path)}.json"
+
+    if cache_file.exists():
+        try:
+            return json.loads(cache_file.read_text())
+        except (OSError, json.JSONDecodeError):
+            pass  # Corrupt entry - fall through and re-decrypt
+
+    import sops_age  # Imports PyYAML, so only load it on a cache miss
+
+    secrets = sops_age.decrypt_file(secrets_path, _AGE_KEY_FILE)
+    if secrets is None:
+        secrets = _run_sops(secrets_file)
+    if secrets:
+        _write_secrets_cache(cache_file, secrets)
+    return secrets
+
+
+def _run_sops(secrets_file: str) -> dict[str, Any]:
+    """Decrypt a secrets file with the sops CLI."""
+    secrets_path = MCP_HUB_DIR / secrets_file
+
+    try:
+        # libyaml parses the raw bytes, so skip decoding stdout to str.
+        # stderr is kept for the warning below.
+        result = subprocess.run(
+            ["sops", "--config", _SOPS_CONFIG_STR, "-d", str(secrets_path)],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+            env=_SOPS_ENV,
+        )
+        return _yaml_load(result.stdout) or {}
+    except subprocess.CalledProcessError as e:
+        stderr = e.stderr.decode(errors="replace")
+        print(f"  Warning: Failed to decrypt {secrets_file}: {stderr}")
+        _DECRYPT_FAILURES.add(secrets_file)
+        return {}
+    except FileNotFoundError:
+        print("  Warning: SOPS not installed, using environment variables")
+        _DECRYPT_FAILURES.add(secrets_file)
+        return {}
+
+
+def decrypt_all_secrets(servers: dict[str, dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Decrypt every distinct secrets file used by an enabled server.
+
+    Each sops call is subprocess-bound, so the files are decrypted
+    concurrently and each file is decrypted at most once, even when it is
+    shared by several servers.
+    """
+    files = _secrets_files(servers)
+    purge_secrets_cache(files)
+    if not files:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(MAX_DECRYPT_WORKERS, len(files))) as executor:
+        return dict(zip(files, executor.map(decrypt_secrets, files)))
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_placeholder(value: str) -> tuple[str, str | None] | None:
+    """Parse ${VAR} or ${VAR:-default} into (var_name, default)."""
+    match = _PLACEHOLDER.match(value)
+    if match is None:
+        return None
+    return match.group(1), match.group(2)
+
+
+def resolve_env_var(value: Any, secrets: dict[str, Any]) -> Any:
+    """Resolve environment variable references like ${VAR} or ${VAR:-default}."""
+    # Most values are plain strings; reject them before touching the regex
+    if type(value) is not str or not value or value[0] != "$":
+        return value
+
+    placeholder = _parse_placeholder(value)
+    if placeholder is None:
+        return value
+    var_name, default = placeholder
+
+    # Check secrets first, then environment
+    if var_name in secrets:
+        return secrets[var_name]
+    elif var_name in os.environ:
+        return os.environ[var_name]
+    elif default is not None:
+        return default
+    else:
+        # Return the placeholder - Claude will resolve from environment
+        return value
+
+
+# Receives progress messages; print, or a per-server buffer's append
+_Log = Callable[[str], None]
+
+
+def _env_section(server: dict[str, Any], secrets: dict[str, Any]) -> dict[str, Any]:
+    """Return {"env": resolved_env} if the server sets env, else {}."""
+    if "env" not in server:
+        return {}
+
+    server_env: dict[str, Any] = server["env"]
+    if "$" not in repr(server_env):
+        # No placeholders anywhere - nothing to resolve
+        return {"env": server_env.copy()}
+    return {"env": {key: resolve_env_var(value, secrets) for key, value in server_env.items()}}
+
+
+def _build_npx(
+    name: str,
+    server: dict[str, Any],
+    secrets: dict[str, Any],
+    log: _Log,
+) -> dict[str, Any] | None:
+    return {
+        "type": server.get("transport", "stdio"),
+        "command": "npx",
+        "args": ["-y", server.get("package"), *server.get("args", [])],
+        **_env_section(server, secrets),
+    }
+
+
+def _build_npm(
+    name: str,
+    server: dict[str, Any],
+    secrets: dict[str, Any],
+    log: _Log,
+) -> dict[str, Any] | None:
+    return {
+        "type": server.get("transport", "stdio"),
+        "command": "npx",
+        "args": ["-y", server.get("package")],
+        **_env_section(server, secrets),
+    }
+
+
+def _build_pip(
+    name: str,
+    server: dict[str, Any],
+    secrets: dict[str, Any],
+    log: _Log,
+) -> dict[str, Any] | None:
+    command = server.get("command", ["python", "-m", server.get("package")])
+    return {
+        "type": server.get("transport", "stdio"),
+        "command": command[0],
+        "args": command[1:],
+        **_env_section(server, secrets),
+    }
+
+
+def _build_docker(
+    name: str,
+    server: dict[str, Any],
+    secrets: dict[str, Any],
+    log: _Log,
+) -> dict[str, Any] | None:
+    return {
+        "type": server.get("transport", "stdio"),
+        "command": "docker",
+        # Pass each environment variable through to docker run
+        "args": [
+            "run", "-i", "--rm",
+            *(flag for env_name in server.get("env", {}) for flag in ("-e", env_name)),
+            server.get("image"),
+        ],
+        **_env_section(server, secrets),
+    }
+
+
+def _build_local(
+    name: str,
+    server: dict[str, Any],
+    secrets: dict[str, Any],
+    log: _Log,
+) -> dict[str, Any] | None:
+    command = server.get("command", ["node", "./dist/index.js"])
+    return {
+        "type": server.get("transport", "stdio"),
+        "command": command[0],
+        "args": command[1:],
+        # Set working directory for local servers
+        "cwd": str(MCP_HUB_DIR / server["path"]),
+        **_env_section(server, secrets),
+    }
+
+
+def _build_remote(
+    name: str,
+    server: dict[str, Any],
+    secrets: dict[str, Any],
+    log: _Log,
+) -> dict[str, Any] | None:
+    # Remote MCP servers use HTTP/SSE transport with a URL
+    url = server.get("url")
+    if not url:
+        log(f"  Warning: Remote server {name} missing URL")
+        return None
+    # Resolve any environment variables in the URL
+    resolved_url = resolve_env_var(url, secrets)
+    if resolved_url.startswith("${"):
+        log(f"  Warning: URL not configured for {name}, skipping")
+        return None
+    # Remote servers don't need command/args - just url and type
+    return {
+        "type": server.get("transport", "stdio"),
+        "url": resolved_url,
+        **_env_section(server, secrets),
+    }
+
+
+_Builder = Callable[[str, dict[str, Any], dict[str, Any], _Log], dict[str, Any] | None]
+
+# Server "source" -> builder of its Claude configuration
+_BUILDERS: dict[Any, _Builder] = {
+    "npx": _build_npx,
+    "npm": _build_npm,
+    "pip": _build_pip,
+    "docker": _build_docker,
+    "local": _build_local,
+    "remote": _build_remote,
+}
+
+
+def build_server_config(
+    name: str,
+    server: dict[str, Any],
+    secrets: dict[str, Any],
+    log: _Log = print,
+) -> dict[str, Any] | None:
+    """Build a single server configuration for Claude.
+
+    Progress messages go to log, so callers building several servers at
+    once can buffer each server's output.
+    """
+    if not server.get("enabled", True):
+        log(f"  Skipping {name} (disabled)")
+        return None
+
+    source = server.get("source")
+    builder = _BUILDERS.get(source)
+    if builder is None:
+        log(f"  Warning: Unknown source type for {name}: {source}")
+        return None
+    return builder(name, server, secrets, log)
+
+
+def generate_claude_config(config: dict[str, Any]) -> dict[str, Any]:
+    """Generate the complete mcpServers configuration."""
+    mcp_servers: dict[str, Any] = {}
+    servers = config.get("servers", {})
+
+    # Decrypt all secrets files up front, in parallel
+    secrets_cache = decrypt_all_secrets(servers)
+
+    def build(item: tuple[str, dict[str, Any]]) -> tuple[dict[str, Any] | None, list[str]]:
+        name, server = item
+        lines = [f"Processing: {name}"]
+        secrets = secrets_cache.get(server.get("secrets_file", ""), {})
+        server_config = build_server_config(name, server, secrets, lines.append)
+        if server_config:
+            lines.append(f"  ✓ Added {name}")
+        return server_config, lines
+
+    # Servers are independent, so build them concurrently. Output is
+    # buffered per server and results are collected in config order, so
+    # both the log and the generated file stay deterministic.
+    items = list(servers.items())
+    if items:
+        with ThreadPoolExecutor(max_workers=min(MAX_BUILD_WORKERS, len(items))) as executor:
+            results = list(executor.map(build, items))
+    else:
+        results = []
+
+    for (name, _), (server_config, lines) in zip(items, results):
+        print("\n".join(lines))
+        if server_config:
+            mcp_servers[name] = server_config
+
+    return {"mcpServers": mcp_servers}
+
+
+def write_output(mcp_config: dict[str, Any]) -> bool:
+    """Write the generated config to OUTPUT_FILE unless it is unchanged.
+
+    Returns:
+        True if OUTPUT_FILE was rewritten
+    """
+    data = dumps(mcp_config)
+    digest = hashlib.sha256(data).hexdigest()
+    try:
+        if OUTPUT_FILE.exists() and OUTPUT_HASH_FILE.read_text().strip() == digest:
+            return False
+    except OSError:
+        pass  # No recorded hash - write unconditionally
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    _write_atomic(OUTPUT_FILE, data, 0o644)
+    _write_atomic(OUTPUT_HASH_FILE, f"{digest}\n".encode(), 0o644)
+    return True
+
+
+def update_claude_json(mcp_config: dict[str, Any]) -> None:
+    """Update ~/.claude.json with the new mcpServers configuration."""
+    # Resolve so a symlinked ~/.claude.json is updated in place, not replaced
+    claude_json_path = (Path.home() / ".claude.json").resolve()
+
+    # Read existing config
+    if claude_json_path.exists():
+        data = claude_json_path.read_bytes()
+        claude_config: dict[str, Any] = json.loads(data)
+        mode = claude_json_path.stat().st_mode & 0o777
+    else:
+        data = b""
+        claude_config = {}
+        mode = 0o600
+
+    # Update mcpServers
+    claude_config["mcpServers"] = mcp_config["mcpServers"]
+
+    # Write back, atomically, and only if something changed
+    new_data = dumps(claude_config)
+    if new_data == data:
+        print(f"\n✓ {claude_json_path} already up to date")
+        return
+
+    _write_atomic(claude_json_path, new_data, mode)
+    print(f"\n✓ Updated {claude_json_path}")
@@ -0,0 +1,22 @@
+#!/bin/bash
+# Run a Python script under the fastest available interpreter.
+#
+# Prefers PyPy when it is installed and can import the generator's
+# dependencies. Otherwise runs python3 with PYTHON_JIT=1, which enables the
+# experimental JIT on CPython 3.13+ builds that include it and is ignored
+# everywhere else. A mypyc build of claude_config_core (make compile) only
+# loads under CPython, so PyPy is skipped when one is present.
+#
+# Usage: ./scripts/python-launcher.sh scripts/generate-claude-config.py [args...]
+
+MCP_HUB_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+
+has_mypyc_build() {
+    compgen -G "$MCP_HUB_DIR/scripts/claude_config_core.*.so" >/dev/null
+}
+
+if command -v pypy3 >/dev/null 2>&1 && ! has_mypyc_build && pypy3 -c "import yaml" 2>/dev/null; then
+    exec pypy3 "$@"
+fi
+
+PYTHON_JIT="${PYTHON_JIT:-1}" exec python3 "$@"
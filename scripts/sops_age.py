@@ -0,0 +1,167 @@
+"""
+In-process decryption of age-encrypted SOPS files.
+
+Decrypts the SOPS data key with pyrage, then each ENC[AES256_GCM,...]
+value with AES-GCM, and verifies the file MAC - all without spawning the
+sops CLI. Only the subset of SOPS used here is supported: YAML files with
+an age recipient we hold a key for. Anything else (KMS/PGP-only files,
+Shamir key groups, missing pyrage, a MAC mismatch) makes decrypt_file()
+return None so the caller can fall back to sops, which then reports the
+problem itself.
+
+pyrage and cryptography are optional: pip install pyrage cryptography
+"""
+
+import base64
+import hashlib
+import re
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+try:
+    import pyrage
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:
+    pyrage = None  # type: ignore[assignment]
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
+# ENC[AES256_GCM,data:<b64>,iv:<b64>,tag:<b64>,type:<type>]
+_ENCRYPTED_VALUE = re.compile(
+    r"\AENC\[AES256_GCM,data:(?P<data>[^,]*),iv:(?P<iv>[^,]+),"
+    r"tag:(?P<tag>[^,]+),type:(?P<type>[a-z]+)\]\Z"
+)
+
+
+class SopsDecryptError(Exception):
+    """Raised when a file can't be decrypted in-process."""
+    pass
+
+
+def _load_identities(identities_file: Path) -> list[Any]:
+    """Load age X25519 identities from an age key file."""
+    identities = []
+    for line in identities_file.read_text().splitlines():
+        line = line.strip()
+        if line.startswith("AGE-SECRET-KEY-"):
+            identities.append(pyrage.x25519.Identity.from_str(line))
+    return identities
+
+
+def _decrypt_data_key(metadata: dict[str, Any], identities: list[Any]) -> bytes:
+    """Decrypt the SOPS data key with the first age recipient we hold a key for."""
+    for recipient in metadata.get("age") or []:
+        try:
+            return pyrage.decrypt(recipient["enc"].encode(), identities)
+        except Exception:
+            continue  # Not one of our recipients
+    raise SopsDecryptError("no age identity can decrypt the data key")
+
+
+def _decrypt_value(value: str, key: bytes, additional_data: str) -> Any:
+    """Decrypt a single ENC[AES256_GCM,...] value and restore its type."""
+    match = _ENCRYPTED_VALUE.match(value)
+    if match is None:
+        raise SopsDecryptError("malformed encrypted value")
+
+    aesgcm = AESGCM(key)
+    plaintext = aesgcm.decrypt(
+        base64.b64decode(match["iv"]),
+        base64.b64decode(match["data"]) + base64.b64decode(match["tag"]),
+        additional_data.encode(),
+    )
+
+    value_type = match["type"]
+    if value_type == "str":
+        return plaintext.decode()
+    if value_type == "int":
+        return int(plaintext)
+    if value_type == "float":
+        return float(plaintext)
+    if value_type == "bool":
+        return plaintext.decode().lower() in ("true", "t", "1")
+    if value_type == "bytes":
+        # sops -d emits bytes values as plain strings
+        return plaintext.decode()
+    raise SopsDecryptError(f"unsupported value type: {value_type}")
+
+
+def _to_bytes(value: Any) -> bytes:
+    """Encode a leaf value the way sops does when computing the MAC."""
+    if isinstance(value, bool):
+        return b"True" if value else b"False"
+    if isinstance(value, str):
+        return value.encode()
+    if isinstance(value, int):
+        return str(value).encode()
+    if isinstance(value, float):
+        # Go's strconv.FormatFloat(v, 'f', -1, 64)
+        return format(Decimal(repr(value)), "f").encode()
+    if isinstance(value, bytes):
+        return value
+    raise SopsDecryptError(f"unsupported leaf type: {type(value).__name__}")
+
+
+def _walk(node: Any, path: list[str], key: bytes, mac_only_encrypted: bool, digest: Any) -> Any:
+    """Decrypt a tree in document order, feeding leaves into the MAC digest."""
+    if isinstance(node, dict):
+        return {
+            k: _walk(v, path + [str(k)], key, mac_only_encrypted, digest)
+            for k, v in node.items()
+        }
+    if isinstance(node, list):
+        # List items share their parent's path, as in sops
+        return [_walk(item, path, key, mac_only_encrypted, digest) for item in node]
+
+    encrypted = isinstance(node, str) and node.startswith("ENC[")
+    value = _decrypt_value(node, key, ":".join(path) + ":") if encrypted else node
+    if encrypted or not mac_only_encrypted:
+        digest.update(_to_bytes(value))
+    return value
+
+
+def decrypt_file(path: Path, identities_file: Path) -> dict[str, Any] | None:
+    """Decrypt an age-encrypted SOPS YAML file without the sops CLI.
+
+    Returns:
+        The decrypted document, or None if it must be decrypted by sops.
+    """
+    if pyrage is None or not identities_file.exists():
+        return None
+
+    try:
+        document = yaml.load(path.read_bytes(), Loader=_YamlLoader)
+        metadata = document.pop("sops")
+        # Shamir key groups split the data key across recipients
+        if not metadata.get("age") or metadata.get("key_groups") or metadata.get("shamir_threshold"):
+            return None
+
+        identities = _load_identities(identities_file)
+        data_key = _decrypt_data_key(metadata, identities)
+
+        digest = hashlib.sha512()
+        secrets = _walk(
+            document, [], data_key, bool(metadata.get("mac_only_encrypted")), digest
+        )
+
+        last_modified = metadata["lastmodified"]
+        if isinstance(last_modified, datetime):
+            # Unquoted timestamps are parsed by YAML; sops MACs the RFC 3339 form
+            if last_modified.tzinfo is None:
+                last_modified = last_modified.replace(tzinfo=timezone.utc)
+            last_modified = last_modified.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        expected_mac = _decrypt_value(metadata["mac"], data_key, last_modified)
+        if expected_mac != digest.hexdigest().upper():
+            return None
+
+        return secrets
+    except Exception:
+        # Anything unexpected: let the sops CLI handle (and report) it
+        return None
@@ -0,0 +1,6 @@
+"""Make the scripts directory importable, as it is when they run."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
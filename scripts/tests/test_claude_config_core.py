@@ -0,0 +1,22 @@
+"""Tests for the config generator core."""
+
+import json
+from pathlib import Path
+
+import claude_config_core as core
+
+
+class TestDumps:
+    """Tests for dumps()."""
+
+    def test_large_integers_are_kept(self):
+        """Integers orjson can't encode fall back to the stdlib encoder."""
+        data = {"big": 2**70, "name": "x"}
+
+        assert json.loads(core.dumps(data)) == data
+
+    def test_unsupported_values_become_strings(self):
+        """Values JSON has no type for are written as their str()."""
+        data = {"file": Path("/tmp/claude.json")}
+
+        assert json.loads(core.dumps(data)) == {"file": "/tmp/claude.json"}
@@ -0,0 +1,114 @@
+"""Tests for in-process SOPS decryption."""
+
+import base64
+import hashlib
+import os
+
+import pytest
+import yaml
+
+pyrage = pytest.importorskip("pyrage")
+AESGCM = pytest.importorskip("cryptography.hazmat.primitives.ciphers.aead").AESGCM
+
+import sops_age  # noqa: E402
+
+LAST_MODIFIED = "2026-01-02T03:04:05Z"
+
+SECRETS = {
+    "api_key": "sk-test-123",
+    "port": 5432,
+    "ratio": 0.25,
+    "enabled": True,
+    "hosts": ["db1.example.com", "db2.example.com"],
+    "nested": {"user": "admin", "retries": 3},
+}
+
+
+def plaintext(value) -> bytes:
+    """Format a leaf as sops does before encrypting it and computing the MAC."""
+    return str(value).encode()
+
+
+def encrypt_value(value, key: bytes, additional_data: str) -> str:
+    """Encrypt a leaf the way sops does, as ENC[AES256_GCM,...]."""
+    value_type = type(value).__name__
+    iv = os.urandom(32)
+    sealed = AESGCM(key).encrypt(iv, plaintext(value), additional_data.encode())
+    data, tag = sealed[:-16], sealed[-16:]
+    b64 = lambda raw: base64.b64encode(raw).decode()  # noqa: E731
+    return f"ENC[AES256_GCM,data:{b64(data)},iv:{b64(iv)},tag:{b64(tag)},type:{value_type}]"
+
+
+def encrypt_tree(node, path: list[str], key: bytes, digest):
+    """Encrypt every leaf in document order, feeding them into the MAC."""
+    if isinstance(node, dict):
+        return {k: encrypt_tree(v, path + [k], key, digest) for k, v in node.items()}
+    if isinstance(node, list):
+        return [encrypt_tree(item, path, key, digest) for item in node]
+    digest.update(plaintext(node))
+    return encrypt_value(node, key, ":".join(path) + ":")
+
+
+def write_sops_file(path, secrets: dict, recipient, mac: str | None = None) -> None:
+    """Write secrets as an age-encrypted SOPS YAML file."""
+    data_key = os.urandom(32)
+    digest = hashlib.sha512()
+    document = encrypt_tree(secrets, [], data_key, digest)
+    document["sops"] = {
+        "age": [{
+            "recipient": str(recipient),
+            "enc": pyrage.encrypt(data_key, [recipient], armored=True).decode(),
+        }],
+        "lastmodified": LAST_MODIFIED,
+        "mac": encrypt_value(mac or digest.hexdigest().upper(), data_key, LAST_MODIFIED),
+        "version": "3.9.0",
+    }
+    path.write_text(yaml.safe_dump(document, sort_keys=False))
+
+
+@pytest.fixture
+def identity():
+    return pyrage.x25519.Identity.generate()
+
+
+@pytest.fixture
+def identities_file(tmp_path, identity):
+    path = tmp_path / "keys.txt"
+    path.write_text(f"# created: {LAST_MODIFIED}\n{identity}\n")
+    return path
+
+
+class TestDecryptFile:
+    """Tests for decrypt_file()."""
+
+    def test_round_trip(self, tmp_path, identity, identities_file):
+        """Every value type decrypts back to the original."""
+        path = tmp_path / "secrets.yaml"
+        write_sops_file(path, SECRETS, identity.to_public())
+
+        assert sops_age.decrypt_file(path, identities_file) == SECRETS
+
+    def test_tampered_mac_falls_back(self, tmp_path, identity, identities_file):
+        """A MAC that doesn't match the values leaves the file to sops."""
+        path = tmp_path / "secrets.yaml"
+        write_sops_file(path, SECRETS, identity.to_public(), mac="0" * 128)
+
+        assert sops_age.decrypt_file(path, identities_file) is None
+
+    def test_non_age_file_falls_back(self, tmp_path, identities_file):
+        """Files without an age recipient are left to sops."""
+        path = tmp_path / "secrets.yaml"
+        path.write_text(yaml.safe_dump({
+            "api_key": "ENC[AES256_GCM,data:AA==,iv:AA==,tag:AA==,type:str]",
+            "sops": {"kms": [{"arn": "arn:aws:kms:us-west-2:111122223333:key/x"}],
+                     "lastmodified": LAST_MODIFIED, "mac": "", "version": "3.9.0"},
+        }))
+
+        assert sops_age.decrypt_file(path, identities_file) is None
+
+    def test_other_recipient_falls_back(self, tmp_path, identities_file):
+        """A file encrypted only for someone else's key is left to sops."""
+        path = tmp_path / "secrets.yaml"
+        write_sops_file(path, SECRETS, pyrage.x25519.Identity.generate().to_public())
+
+        assert sops_age.decrypt_file(path, identities_file) is None
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Convert a YAML file to JSON.
+
+Used to pre-build generated/config.json from config.yaml (`make
+config-json`), so that generate-claude-config.py can load the config
+without parsing YAML.
+
+Usage:
+    yaml_to_json.py [SOURCE] [DEST]
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+MCP_HUB_DIR = Path(__file__).parent.parent
+
+
+def main():
+    source = Path(sys.argv[1]) if len(sys.argv) > 1 else MCP_HUB_DIR / "config.yaml"
+    dest = Path(sys.argv[2]) if len(sys.argv) > 2 else MCP_HUB_DIR / "generated" / "config.json"
+
+    data = yaml.load(source.read_bytes(), Loader=_YamlLoader)
+
+    # Write via a temporary file so readers never see a partial file
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = dest.with_name(f"{dest.name}.tmp")
+    tmp_file.write_text(json.dumps(data, indent=2))
+    os.replace(tmp_file, dest)
+    print(f"✓ Wrote {dest}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,205 @@
+"""
+Request coalescing for concurrent tool calls.
+
+Tool calls that arrive within a short window of each other are sent to
+the TWS service in one SendMessageBatch, and a single long-polling loop
+receives every outstanding response and hands each one back to its
+caller by execution ID. Two tools called back to back therefore share
+one send and one wait instead of paying a full round-trip each.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from .sqs_client import (
+    FOREIGN_MESSAGE_BACKOFF_SECONDS,
+    LONG_POLL_SECONDS,
+    AsyncSQSClient,
+    SQSTimeoutError,
+)
+
+logger = logging.getLogger(__name__)
+
+# How long to collect requests before sending them as one batch
+DEFAULT_WINDOW_SECONDS = 0.05
+
+# Longest a coalesced request may wait for its response, unless submit()
+# is given a timeout of its own
+DEFAULT_TIMEOUT_MINUTES = 20
+
+
+class RequestCoalescer:
+    """
+    Batches concurrent requests to the TWS service.
+
+    All methods must be called from the same event loop. SQS calls go
+    through an AsyncSQSClient so that the loop keeps accepting new tool
+    calls while a batch is in flight.
+
+    Usage:
+        coalescer = RequestCoalescer(AsyncSQSClient(client))
+        response = await coalescer.submit("find_symbols", {"query": "AAPL"})
+    """
+
+    def __init__(
+        self,
+        client: AsyncSQSClient,
+        window_seconds: float = DEFAULT_WINDOW_SECONDS,
+        timeout_minutes: int = DEFAULT_TIMEOUT_MINUTES,
+        wait_time_seconds: int = LONG_POLL_SECONDS,
+    ):
+        """
+        Initialize the coalescer.
+
+        Args:
+            client: SQS client used to send requests and receive responses
+            window_seconds: How long to collect requests before sending them
+            timeout_minutes: Default maximum time to wait for each response
+            wait_time_seconds: SQS long-polling wait time
+        """
+        self.client = client
+        self.window_seconds = window_seconds
+        self.timeout_minutes = timeout_minutes
+        self.wait_time_seconds = wait_time_seconds
+
+        # (operation, params, future, timeout in minutes) collected during
+        # the current window
+        self._queued: list[tuple[str, Optional[dict], asyncio.Future, float]] = []
+        # Execution ID -> (future, monotonic deadline) for sent requests
+        self._waiting: dict[str, tuple[asyncio.Future, float]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._receive_task: Optional[asyncio.Task] = None
+        # Whether a straggling poll may be hedged; allowed once per batch
+        self._can_hedge = False
+
+    async def submit(
+        self,
+        operation: str,
+        params: Optional[dict] = None,
+        timeout_minutes: Optional[float] = None,
+    ) -> dict:
+        """
+        Send a request with the next batch and wait for its response.
+
+        Args:
+            operation: Operation name (e.g., "tws_health", "account_values")
+            params: Optional parameters for the operation
+            timeout_minutes: Maximum time to wait for this response
+                (defaults to the coalescer's timeout_minutes)
+
+        Returns:
+            Response data from the TWS service
+
+        Raises:
+            SQSTimeoutError: If no response is received within the timeout
+            SQSClientError: If the batch could not be sent
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if timeout_minutes is None:
+            timeout_minutes = self.timeout_minutes
+        self._queued.append((operation, params, future, timeout_minutes))
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush_after_window())
+        return await future
+
+    async def _flush_after_window(self) -> None:
+        """Send everything queued during the window as one batch."""
+        await asyncio.sleep(self.window_seconds)
+        queued, self._queued = self._queued, []
+        self._flush_task = None
+
+        try:
+            execution_ids = await self.client.submit_requests(
+                [(operation, params) for operation, params, _, _ in queued]
+            )
+        except Exception as e:
+            for _, _, future, _ in queued:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # Each request keeps its own deadline, so a quick health check
+        # doesn't wait as long as an OHLCV download sent with it
+        sent_at = time.monotonic()
+        for execution_id, (_, _, future, timeout_minutes) in zip(execution_ids, queued):
+            self._waiting[execution_id] = (future, sent_at + timeout_minutes * 60)
+        self._can_hedge = True
+
+        if self._receive_task is None or self._receive_task.done():
+            self._receive_task = asyncio.create_task(self._receive_loop())
+
+    def _start_poll(self) -> asyncio.Task:
+        """Start one receive call for every request still waiting."""
+        # Pass the live key view so requests sent during this poll are
+        # matched too rather than released back to the queue
+        return asyncio.create_task(
+            self.client.receive_responses(self._waiting.keys(), self.wait_time_seconds)
+        )
+
+    def _hedge_deadline(self, polls: dict[asyncio.Task, float]) -> Optional[float]:
+        """Monotonic time at which to hedge the single running poll, if any."""
+        delay = self.client.hedge_delay()
+        if not self._can_hedge or not self._waiting or delay is None or len(polls) != 1:
+            return None
+        return next(iter(polls.values())) + delay
+
+    async def _receive_loop(self) -> None:
+        """Poll for responses until no request is waiting for one."""
+        # Running polls -> monotonic start time. A poll that takes much
+        # longer than usual is raced by a second one; both are drained
+        # before the loop exits so no received response is dropped.
+        polls: dict[asyncio.Task, float] = {}
+
+        while self._waiting or polls:
+            if not polls:
+                polls[self._start_poll()] = time.monotonic()
+
+            # Wake for a hedge or for the earliest deadline, whichever is
+            # first, so a short timeout isn't stretched to a full long-poll
+            hedge_at = self._hedge_deadline(polls)
+            wake_at = min(
+                (deadline for _, deadline in self._waiting.values()), default=None
+            )
+            if hedge_at is not None and (wake_at is None or hedge_at < wake_at):
+                wake_at = hedge_at
+            done, _ = await asyncio.wait(
+                polls,
+                timeout=None if wake_at is None else max(wake_at - time.monotonic(), 0),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done and hedge_at is not None and time.monotonic() >= hedge_at:
+                logger.info("Poll is taking longer than usual; starting a hedged receive")
+                polls[self._start_poll()] = time.monotonic()
+                self._can_hedge = False
+
+            for task in done:
+                poll_started = polls.pop(task)
+                try:
+                    received = task.result()
+                except Exception as e:
+                    logger.warning(f"Error receiving message: {e}")
+                    received = {}
+                    await asyncio.sleep(1.0)
+                else:
+                    if not received and not polls and time.monotonic() - poll_started < 1.0:
+                        # Only other consumers' messages; don't spin on them
+                        await asyncio.sleep(FOREIGN_MESSAGE_BACKOFF_SECONDS)
+
+                for execution_id, response in received.items():
+                    entry = self._waiting.pop(execution_id, None)
+                    if entry is not None and not entry[0].done():
+                        entry[0].set_result(response)
+
+            now = time.monotonic()
+            for execution_id, (future, deadline) in list(self._waiting.items()):
+                if future.done():
+                    # Caller was cancelled; stop waiting on its behalf
+                    del self._waiting[execution_id]
+                elif now >= deadline:
+                    del self._waiting[execution_id]
+                    future.set_exception(SQSTimeoutError(
+                        f"Timeout waiting for response. Execution ID(s): {execution_id}"
+                    ))
@@ -20,20 +20,28 @@ Environment Variables:
     AWS_SECRET_ACCESS_KEY: AWS secret key
 """
 
+import asyncio
 import json
 import logging
 import os
 import sys
-from typing import Any
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
-from mcp.server import Server
-from mcp.server.stdio import stdio_server
-from mcp.types import (
-    TextContent,
-    Tool,
-)
+# orjson is optional; it serializes large OHLCV payloads much faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# mcp (Pydantic models) and boto3 are imported lazily so that spawning the
+# stdio process and importing this module stay cheap.
+if TYPE_CHECKING:
+    from mcp.server import Server
+    from mcp.types import TextContent, Tool
 
-from .sqs_client import SQSClient, SQSClientError, SQSTimeoutError
+    from .coalescer import RequestCoalescer
+    from .sqs_client import SQSClient
 
 # Configure logging
 logging.basicConfig(
@@ -43,121 +51,218 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize the MCP server
-server = Server("ibkr-mcp")
+# Lazy-initialized SQS client, preloaded in the background by run_server()
+_sqs_client: "SQSClient | None" = None
+_sqs_client_lock = threading.Lock()
+
+# Lazy-initialized coalescer that batches concurrent tool calls
+_coalescer: "RequestCoalescer | None" = None
+
+# Tool models, built once on first list_tools() call and never mutated
+_tools: "tuple[Tool, ...] | None" = None
+
+# Exception class -> error message template, built on first handle_error()
+# call so that sqs_client (and boto3) isn't imported just to define it
+_error_messages: "dict[type, str] | None" = None
 
-# Lazy-initialized SQS client
-_sqs_client: SQSClient | None = None
+# Tool results larger than this are returned as several text items
+RESPONSE_CHUNK_BYTES = 1 << 20
 
 
-def get_sqs_client() -> SQSClient:
+def get_sqs_client() -> "SQSClient":
     """Get or create the SQS client."""
     global _sqs_client
     if _sqs_client is None:
-        request_queue = os.environ.get("IBKR_REQUEST_QUEUE_URL")
-        response_queue = os.environ.get("IBKR_RESPONSE_QUEUE_URL")
-
-        if not request_queue or not response_queue:
-            raise ValueError(
-                "IBKR_REQUEST_QUEUE_URL and IBKR_RESPONSE_QUEUE_URL environment "
-                "variables must be set. See README for configuration details."
-            )
-
-        _sqs_client = SQSClient(
-            request_queue_url=request_queue,
-            response_queue_url=response_queue,
-            region=os.environ.get("AWS_REGION", "us-west-2"),
-        )
+        with _sqs_client_lock:
+            if _sqs_client is None:
+                from .sqs_client import SQSClient
+
+                request_queue = os.environ.get("IBKR_REQUEST_QUEUE_URL")
+                response_queue = os.environ.get("IBKR_RESPONSE_QUEUE_URL")
+
+                if not request_queue or not response_queue:
+                    raise ValueError(
+                        "IBKR_REQUEST_QUEUE_URL and IBKR_RESPONSE_QUEUE_URL environment "
+                        "variables must be set. See README for configuration details."
+                    )
+
+                _sqs_client = SQSClient(
+                    request_queue_url=request_queue,
+                    response_queue_url=response_queue,
+                    region=os.environ.get("AWS_REGION", "us-west-2"),
+                )
     return _sqs_client
 
 
-def format_response(data: dict) -> str:
-    """Format response data as readable JSON."""
-    return json.dumps(data, indent=2, default=str)
+def preload_sqs_client() -> None:
+    """Import boto3 and build the SQS client ahead of the first tool call."""
+    try:
+        get_sqs_client().client
+    except Exception as e:
+        # Reported to the user by the first tool call instead
+        logger.debug(f"SQS client preload failed: {e}")
+
+
+def get_coalescer() -> "RequestCoalescer":
+    """Get or create the request coalescer for the SQS client."""
+    global _coalescer
+    if _coalescer is None:
+        from .coalescer import RequestCoalescer
+        from .sqs_client import AsyncSQSClient
 
+        _coalescer = RequestCoalescer(AsyncSQSClient(get_sqs_client()))
+    return _coalescer
 
-def handle_error(error: Exception) -> list[TextContent]:
+
+def _dumps(data: dict) -> bytes:
+    """Serialize response data as indented JSON bytes."""
+    if orjson is not None:
+        # orjson handles datetimes natively; default=str only catches the rest
+        return orjson.dumps(
+            data,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(data, indent=2, default=str).encode()
+
+
+def format_response(data: dict) -> str:
+    """Format response data as readable JSON."""
+    return _dumps(data).decode()
+
+
+def text_response(text: str) -> "list[TextContent]":
+    """Wrap text in a single-item MCP text response."""
+    from mcp.types import TextContent
+
+    return [TextContent(type="text", text=text)]
+
+
+def json_response(prefix: bytes, data: dict) -> "list[TextContent]":
+    """
+    Build a tool response: a header line followed by the result as JSON.
+
+    Results up to RESPONSE_CHUNK_BYTES are a single text item. Larger ones
+    (e.g. OHLCV history) are split at line breaks into several items that
+    concatenate to the same text, and each item is decoded straight from
+    the encoded JSON, so no second multi-megabyte copy is built.
+    """
+    from mcp.types import TextContent
+
+    body = _dumps(data)
+    if len(body) <= RESPONSE_CHUNK_BYTES:
+        return text_response((prefix + body).decode())
+
+    view = memoryview(body)
+    items = [TextContent(type="text", text=prefix.decode())]
+    start = 0
+    while start < len(body):
+        end = start + RESPONSE_CHUNK_BYTES
+        if end < len(body):
+            # Split after a newline, which never falls inside a UTF-8 sequence
+            newline = body.rfind(b"\n", start, end)
+            if newline < 0:
+                newline = body.find(b"\n", end)
+            end = len(body) if newline < 0 else newline + 1
+        items.append(TextContent(type="text", text=str(view[start:end], "utf-8")))
+        start = end
+    return items
+
+
+def _get_error_messages() -> dict[type, str]:
+    """Get the exception class -> message template table, building it once."""
+    global _error_messages
+    if _error_messages is None:
+        from .sqs_client import SQSClientError, SQSTimeoutError
+
+        _error_messages = {
+            SQSTimeoutError: "Request timed out. The TWS service may be unavailable or processing a long operation.\n\nError: {error}",
+            SQSClientError: "SQS communication error. Check AWS credentials and queue access.\n\nError: {error}",
+            Exception: "Unexpected error: {error}",
+        }
+    return _error_messages
+
+
+def error_message(error: Exception) -> str:
+    """Describe an error for the user."""
+    messages = _get_error_messages()
+    # The most specific class in the error's MRO with a message wins
+    for cls in type(error).__mro__:
+        template = messages.get(cls)
+        if template is not None:
+            return template.format(error=error)
+    return f"Unexpected error: {error}"
+
+
+def handle_error(error: Exception) -> "list[TextContent]":
     """Handle errors and return appropriate MCP response."""
-    if isinstance(error, SQSTimeoutError):
-        return [TextContent(
-            type="text",
-            text=f"Request timed out. The TWS service may be unavailable or processing a long operation.\n\nError: {error}"
-        )]
-    elif isinstance(error, SQSClientError):
-        return [TextContent(
-            type="text",
-            text=f"SQS communication error. Check AWS credentials and queue access.\n\nError: {error}"
-        )]
-    else:
-        return [TextContent(
-            type="text",
-            text=f"Unexpected error: {error}"
-        )]
+    return text_response(error_message(error))
 
 
 # =============================================================================
 # Tool Definitions
 # =============================================================================
 
-TOOLS = [
-    Tool(
-        name="ibkr_health",
-        description="Check the health of the TWS connection. Returns connection status, server time, and ping duration.",
-        inputSchema={
+# Plain dicts so that no Pydantic models are built at import time
+TOOL_SPECS: list[dict[str, Any]] = [
+    {
+        "name": "ibkr_health",
+        "description": "Check the health of the TWS connection. Returns connection status, server time, and ping duration.",
+        "inputSchema": {
             "type": "object",
             "properties": {},
             "required": [],
         },
-    ),
-    Tool(
-        name="ibkr_account_summary",
-        description="Get account values including balances, buying power, and P&L. Data is uploaded to S3 and the S3 URI is returned.",
-        inputSchema={
+    },
+    {
+        "name": "ibkr_account_summary",
+        "description": "Get account values including balances, buying power, and P&L. Data is uploaded to S3 and the S3 URI is returned.",
+        "inputSchema": {
             "type": "object",
             "properties": {},
             "required": [],
         },
-    ),
-    Tool(
-        name="ibkr_positions",
-        description="Get current portfolio positions with quantities, average costs, and exchange rates. Returns S3 URI where positions are stored as Parquet.",
-        inputSchema={
+    },
+    {
+        "name": "ibkr_positions",
+        "description": "Get current portfolio positions with quantities, average costs, and exchange rates. Returns S3 URI where positions are stored as Parquet.",
+        "inputSchema": {
             "type": "object",
             "properties": {},
             "required": [],
         },
-    ),
-    Tool(
-        name="ibkr_daily_ohlcv",
-        description="Get daily OHLCV (Open, High, Low, Close, Volume) data for all tracked symbols. Processes 7 days of daily bars and stores in S3.",
-        inputSchema={
+    },
+    {
+        "name": "ibkr_daily_ohlcv",
+        "description": "Get daily OHLCV (Open, High, Low, Close, Volume) data for all tracked symbols. Processes 7 days of daily bars and stores in S3.",
+        "inputSchema": {
             "type": "object",
             "properties": {},
             "required": [],
         },
-    ),
-    Tool(
-        name="ibkr_hourly_ohlcv",
-        description="Get hourly OHLCV data for all tracked symbols. Processes 7 days of hourly bars and stores in S3.",
-        inputSchema={
+    },
+    {
+        "name": "ibkr_hourly_ohlcv",
+        "description": "Get hourly OHLCV data for all tracked symbols. Processes 7 days of hourly bars and stores in S3.",
+        "inputSchema": {
             "type": "object",
             "properties": {},
             "required": [],
         },
-    ),
-    Tool(
-        name="ibkr_contract_details",
-        description="Get detailed contract information for all tracked symbols including trading hours, ISIN, and exchange details. Stored in S3.",
-        inputSchema={
+    },
+    {
+        "name": "ibkr_contract_details",
+        "description": "Get detailed contract information for all tracked symbols including trading hours, ISIN, and exchange details. Stored in S3.",
+        "inputSchema": {
             "type": "object",
             "properties": {},
             "required": [],
         },
-    ),
-    Tool(
-        name="ibkr_search_symbols",
-        description="Search for contracts matching a query string. Useful for finding symbols, contract IDs, and available exchanges.",
-        inputSchema={
+    },
+    {
+        "name": "ibkr_search_symbols",
+        "description": "Search for contracts matching a query string. Useful for finding symbols, contract IDs, and available exchanges.",
+        "inputSchema": {
             "type": "object",
             "properties": {
                 "query": {
@@ -167,11 +272,11 @@ TOOLS = [
             },
             "required": ["query"],
         },
-    ),
-    Tool(
-        name="ibkr_contract_by_id",
-        description="Get detailed information for a specific contract by its IBKR contract ID (conId).",
-        inputSchema={
+    },
+    {
+        "name": "ibkr_contract_by_id",
+        "description": "Get detailed information for a specific contract by its IBKR contract ID (conId).",
+        "inputSchema": {
             "type": "object",
             "properties": {
                 "contract_id": {
@@ -186,11 +291,11 @@ TOOLS = [
             },
             "required": ["contract_id"],
         },
-    ),
-    Tool(
-        name="ibkr_custom_ohlcv",
-        description="Get OHLCV data for specific symbols (not just tracked ones). Specify symbols with their properties.",
-        inputSchema={
+    },
+    {
+        "name": "ibkr_custom_ohlcv",
+        "description": "Get OHLCV data for specific symbols (not just tracked ones). Specify symbols with their properties.",
+        "inputSchema": {
             "type": "object",
             "properties": {
                 "symbols": {
@@ -221,125 +326,251 @@ TOOLS = [
             },
             "required": ["symbols"],
         },
-    ),
+    },
+    {
+        "name": "ibkr_batch",
+        "description": "Run several IBKR tools in one round-trip. Requests are sent together and results are returned in call order. Use this instead of calling tools one after another.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "calls": {
+                    "type": "array",
+                    "description": "Tool calls to run",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "tool": {"type": "string", "description": "Tool name (e.g., 'ibkr_positions')"},
+                            "arguments": {"type": "object", "description": "Arguments for the tool", "default": {}},
+                        },
+                        "required": ["tool"],
+                    },
+                },
+            },
+            "required": ["calls"],
+        },
+    },
 ]
 
 
-@server.list_tools()
-async def list_tools() -> list[Tool]:
+async def list_tools() -> "list[Tool]":
     """List available IBKR tools."""
-    return TOOLS
+    global _tools
+    if _tools is None:
+        from mcp.types import Tool
+
+        _tools = tuple(Tool(**spec) for spec in TOOL_SPECS)
+    # Hand out a fresh list so callers can't mutate the shared tuple
+    return list(_tools)
+
+
+# =============================================================================
+# Tool Dispatch
+# =============================================================================
+
+# Tool name -> (response header, minutes to wait for the response, builder
+# of the (operation, params) request sent for it). Headers are str.format
+# templates filled from the tool arguments. The timeouts are those of the
+# matching SQSClient convenience methods. ibkr_batch has no request of its
+# own; see run_batch().
+_DISPATCH: dict[
+    str,
+    tuple[str, Optional[int], Optional[Callable[[dict[str, Any]], tuple[str, Optional[dict]]]]],
+] = {
+    "ibkr_health": (
+        "TWS Health Check",
+        2,
+        lambda args: ("tws_health", None),
+    ),
+    "ibkr_account_summary": (
+        "Account Summary",
+        5,
+        lambda args: ("account_values", None),
+    ),
+    "ibkr_positions": (
+        "Positions",
+        5,
+        lambda args: ("raw_positions", None),
+    ),
+    "ibkr_daily_ohlcv": (
+        "Daily OHLCV Processing Result",
+        20,
+        lambda args: ("daily_ohlcv", None),
+    ),
+    "ibkr_hourly_ohlcv": (
+        "Hourly OHLCV Processing Result",
+        20,
+        lambda args: ("hourly_ohlcv", None),
+    ),
+    "ibkr_contract_details": (
+        "Contract Details Processing Result",
+        20,
+        lambda args: ("contract_details", None),
+    ),
+    "ibkr_search_symbols": (
+        "Symbol Search Results for '{query}'",
+        2,
+        lambda args: ("find_symbols", {"query": args["query"]}),
+    ),
+    "ibkr_contract_by_id": (
+        "Contract Details for ID {contract_id}",
+        2,
+        lambda args: (
+            "get_contract_details_by_id",
+            {
+                "contract_id": args["contract_id"],
+                "check_ohlcv_availability": args.get("check_ohlcv", False),
+            },
+        ),
+    ),
+    "ibkr_custom_ohlcv": (
+        "Custom OHLCV Result",
+        20,
+        lambda args: (
+            "ohlcv",
+            {
+                "symbols": args["symbols"],
+                "duration_str": args.get("duration", "7 D"),
+                "bar_size_setting": args.get("bar_size", "1 day"),
+            },
+        ),
+    ),
+    "ibkr_batch": ("Batch Results", None, None),
+}
+
+# Pre-encoded "<header>:\n" prefixes for tools whose header takes no
+# arguments; the rest are formatted per call.
+_HEADERS: dict[str, bytes] = {
+    name: f"{header}:\n".encode()
+    for name, (header, _, _) in _DISPATCH.items()
+    if "{" not in header
+}
+
+# Tool name -> validator returning an error message, or None if the
+# arguments are usable. Tools without required arguments have no entry.
+_VALIDATORS: dict[str, Callable[[dict[str, Any]], Optional[str]]] = {
+    "ibkr_search_symbols": lambda args: (
+        None if args.get("query") else "Error: 'query' parameter is required"
+    ),
+    "ibkr_contract_by_id": lambda args: (
+        None if args.get("contract_id") is not None
+        else "Error: 'contract_id' parameter is required"
+    ),
+    "ibkr_custom_ohlcv": lambda args: (
+        None if args.get("symbols")
+        else "Error: 'symbols' parameter is required and must be non-empty"
+    ),
+    "ibkr_batch": lambda args: (
+        None if args.get("calls")
+        else "Error: 'calls' parameter is required and must be non-empty"
+    ),
+}
+
+
+async def run_batch(coalescer: "RequestCoalescer", arguments: dict[str, Any]) -> dict:
+    """
+    Run an ibkr_batch call, sending all valid sub-calls in one batch.
+
+    Each result has a status of "ok" or "error", so one failed or timed
+    out sub-call doesn't discard the others.
+    """
+    calls = arguments["calls"]
+    results: list[Optional[dict]] = [None] * len(calls)
+    requests = []
+    slots = []
+
+    for i, call in enumerate(calls):
+        tool = call.get("tool")
+        call_args = call.get("arguments") or {}
+
+        _, timeout_minutes, build_request = _DISPATCH.get(tool, (None, None, None))
+        if build_request is None:
+            results[i] = {
+                "tool": tool,
+                "status": "error",
+                "error": f"Tool cannot be batched: {tool}",
+            }
+            continue
+
+        validator = _VALIDATORS.get(tool)
+        error = validator(call_args) if validator else None
+        if error:
+            results[i] = {"tool": tool, "status": "error", "error": error}
+            continue
+
+        requests.append((*build_request(call_args), timeout_minutes))
+        slots.append(i)
+
+    if requests:
+        # Submitted in the same tick, so they go out in one coalesced batch
+        responses = await asyncio.gather(
+            *(
+                coalescer.submit(operation, params, timeout_minutes)
+                for operation, params, timeout_minutes in requests
+            ),
+            return_exceptions=True,
+        )
+        for i, response in zip(slots, responses):
+            tool = calls[i]["tool"]
+            if isinstance(response, asyncio.CancelledError):
+                raise response
+            if isinstance(response, Exception):
+                logger.warning(f"Batched call to {tool} failed: {response}")
+                results[i] = {"tool": tool, "status": "error", "error": error_message(response)}
+            else:
+                results[i] = {"tool": tool, "status": "ok", "result": response}
+
+    return {"results": results}
 
 
-@server.call_tool()
-async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
+async def call_tool(name: str, arguments: dict[str, Any]) -> "list[TextContent]":
     """Handle tool calls."""
-    client = get_sqs_client()
+    entry = _DISPATCH.get(name)
+    if entry is None:
+        return text_response(f"Unknown tool: {name}")
+    header, timeout_minutes, build_request = entry
 
-    try:
-        if name == "ibkr_health":
-            result = client.health_check()
-            return [TextContent(
-                type="text",
-                text=f"TWS Health Check:\n{format_response(result)}"
-            )]
-
-        elif name == "ibkr_account_summary":
-            result = client.account_values()
-            return [TextContent(
-                type="text",
-                text=f"Account Summary:\n{format_response(result)}"
-            )]
-
-        elif name == "ibkr_positions":
-            result = client.positions()
-            return [TextContent(
-                type="text",
-                text=f"Positions:\n{format_response(result)}"
-            )]
-
-        elif name == "ibkr_daily_ohlcv":
-            result = client.daily_ohlcv()
-            return [TextContent(
-                type="text",
-                text=f"Daily OHLCV Processing Result:\n{format_response(result)}"
-            )]
-
-        elif name == "ibkr_hourly_ohlcv":
-            result = client.hourly_ohlcv()
-            return [TextContent(
-                type="text",
-                text=f"Hourly OHLCV Processing Result:\n{format_response(result)}"
-            )]
-
-        elif name == "ibkr_contract_details":
-            result = client.contract_details()
-            return [TextContent(
-                type="text",
-                text=f"Contract Details Processing Result:\n{format_response(result)}"
-            )]
-
-        elif name == "ibkr_search_symbols":
-            query = arguments.get("query", "")
-            if not query:
-                return [TextContent(
-                    type="text",
-                    text="Error: 'query' parameter is required"
-                )]
-            result = client.find_symbols(query)
-            return [TextContent(
-                type="text",
-                text=f"Symbol Search Results for '{query}':\n{format_response(result)}"
-            )]
-
-        elif name == "ibkr_contract_by_id":
-            contract_id = arguments.get("contract_id")
-            if contract_id is None:
-                return [TextContent(
-                    type="text",
-                    text="Error: 'contract_id' parameter is required"
-                )]
-            check_ohlcv = arguments.get("check_ohlcv", False)
-            result = client.get_contract_by_id(contract_id, check_ohlcv=check_ohlcv)
-            return [TextContent(
-                type="text",
-                text=f"Contract Details for ID {contract_id}:\n{format_response(result)}"
-            )]
-
-        elif name == "ibkr_custom_ohlcv":
-            symbols = arguments.get("symbols", [])
-            if not symbols:
-                return [TextContent(
-                    type="text",
-                    text="Error: 'symbols' parameter is required and must be non-empty"
-                )]
-            duration = arguments.get("duration", "7 D")
-            bar_size = arguments.get("bar_size", "1 day")
-            result = client.custom_ohlcv(
-                symbols=symbols,
-                duration_str=duration,
-                bar_size_setting=bar_size,
-            )
-            return [TextContent(
-                type="text",
-                text=f"Custom OHLCV Result:\n{format_response(result)}"
-            )]
+    validator = _VALIDATORS.get(name)
+    error = validator(arguments) if validator else None
+    if error:
+        return text_response(error)
 
-        else:
-            return [TextContent(
-                type="text",
-                text=f"Unknown tool: {name}"
-            )]
+    coalescer = get_coalescer()
 
+    try:
+        # Concurrent calls are coalesced into one SQS round-trip
+        if build_request is None:
+            result = await run_batch(coalescer, arguments)
+        else:
+            result = await coalescer.submit(*build_request(arguments), timeout_minutes)
+        prefix = _HEADERS.get(name)
+        if prefix is None:
+            prefix = f"{header.format(**arguments)}:\n".encode()
+        return json_response(prefix, result)
     except Exception as e:
         logger.exception(f"Error calling tool {name}")
         return handle_error(e)
 
 
+def create_server() -> "Server":
+    """Create the MCP server and register the tool handlers."""
+    from mcp.server import Server
+
+    server = Server("ibkr-mcp")
+    server.list_tools()(list_tools)
+    server.call_tool()(call_tool)
+    return server
+
+
 async def run_server():
     """Run the MCP server."""
+    from mcp.server.stdio import stdio_server
+
     logger.info("Starting IBKR MCP Server...")
+    server = create_server()
     async with stdio_server() as (read_stream, write_stream):
+        # Pay the boto3 import and credential lookup during the MCP
+        # handshake rather than on the first tool call
+        threading.Thread(target=preload_sqs_client, daemon=True).start()
         await server.run(
             read_stream,
             write_stream,
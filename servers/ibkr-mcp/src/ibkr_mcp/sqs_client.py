@@ -10,20 +10,147 @@ Required Environment Variables:
     AWS_REGION: AWS region (default: us-west-2)
 """
 
+import asyncio
+import itertools
 import json
 import logging
+import os
+import threading
 import time
-from datetime import datetime, timedelta
-from typing import Any, Optional
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from datetime import datetime
+from typing import Any, Container, Optional
 from uuid import uuid4
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+# orjson is optional; it encodes and parses large OHLCV bodies much faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_REGION = "us-west-2"
 
+# SQS accepts at most 10 entries per SendMessageBatch call
+MAX_BATCH_SIZE = 10
+
+# Longest long-poll SQS allows. ReceiveMessage returns as soon as a message
+# arrives, so waiting the full 20 s costs no latency and avoids empty polls.
+# The response queue's VisibilityTimeout should be longer than this.
+LONG_POLL_SECONDS = 20
+
+# Pause after a poll that returned early with only other consumers'
+# messages, so that released messages aren't received again in a hot loop
+FOREIGN_MESSAGE_BACKOFF_SECONDS = 0.5
+
+# Straggler mitigation: a poll still running after HEDGE_LATENCY_FACTOR times
+# the usual time-to-response gets a second receive_message racing it
+HEDGE_LATENCY_FACTOR = 2.0
+HEDGE_MIN_SECONDS = 0.5
+
+
+# Execution IDs are "<per-process random prefix>-<counter>": unique across
+# processes and hosts sharing a queue, without a urandom call per request
+_id_prefix = uuid4().hex[:16]
+_id_counter = itertools.count()
+
+
+def _reset_execution_ids() -> None:
+    """Give a forked child its own execution ID prefix."""
+    global _id_prefix, _id_counter
+    _id_prefix = uuid4().hex[:16]
+    _id_counter = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_execution_ids)
+
+
+# Shared by every SQSClient so credentials and config are loaded only once
+_session: Optional[boto3.Session] = None
+# Region -> SQS client. boto3 clients are thread-safe, so all SQSClients in
+# the process share one client, and one connection pool, per region.
+_clients: dict[str, Any] = {}
+_session_lock = threading.Lock()
+
+
+def _get_sqs_client(region: str) -> boto3.client:
+    """Get or create the shared SQS client for a region."""
+    global _session
+    client = _clients.get(region)
+    if client is None:
+        # Sessions aren't thread-safe, so creating clients is serialized too
+        with _session_lock:
+            client = _clients.get(region)
+            if client is None:
+                if _session is None:
+                    _session = boto3.Session()
+                client = _session.client("sqs", config=_client_config(region))
+                _clients[region] = client
+    return client
+
+
+def _client_config(region: str) -> Config:
+    """
+    Build the botocore config for the SQS client.
+
+    Keep-alive and a larger pool let concurrent polls and sends reuse
+    open TLS connections, and adaptive retries back off client-side
+    when SQS throttles.
+    """
+    return Config(
+        region_name=region,
+        max_pool_connections=50,
+        tcp_keepalive=True,
+        retries={"max_attempts": 10, "mode": "adaptive"},
+    )
+
+
+def _encode_body(message: dict) -> str:
+    """Encode a message payload as an SQS message body."""
+    if orjson is not None:
+        return orjson.dumps(message).decode()
+    return json.dumps(message)
+
+
+def _decode_body(body: str) -> Any:
+    """
+    Parse an SQS message body.
+
+    Raises:
+        json.JSONDecodeError: If the body is not valid JSON (orjson's
+            error type is a subclass)
+    """
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+class _PollLatency:
+    """Moving average of how long polls take to return a response."""
+
+    def __init__(self, smoothing: float = 0.2):
+        self.smoothing = smoothing
+        self.average: Optional[float] = None
+
+    def observe(self, seconds: float) -> None:
+        """Record the duration of a poll that returned a response."""
+        if self.average is None:
+            self.average = seconds
+        else:
+            self.average += self.smoothing * (seconds - self.average)
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds after which a running poll counts as a straggler."""
+        if self.average is None:
+            return None
+        return max(HEDGE_MIN_SECONDS, HEDGE_LATENCY_FACTOR * self.average)
+
 
 class SQSClientError(Exception):
     """Base exception for SQS client errors."""
@@ -56,6 +183,9 @@ class SQSClient:
         request_queue_url: str,
         response_queue_url: str,
         region: str = DEFAULT_REGION,
+        use_fifo: Optional[bool] = None,
+        secure_ids: bool = False,
+        hedge_receives: bool = True,
     ):
         """
         Initialize the SQS client.
@@ -64,6 +194,12 @@ class SQSClient:
             request_queue_url: URL for the request queue
             response_queue_url: URL for the response queue
             region: AWS region (defaults to us-west-2)
+            use_fifo: Whether the queues are FIFO queues (defaults to
+                detecting it per queue from the ".fifo" URL suffix)
+            secure_ids: Use a random uuid4 for every execution ID instead
+                of a per-process prefix and counter
+            hedge_receives: Race a second receive against a poll that is
+                taking much longer than usual to return a response
         """
         if not request_queue_url:
             raise ValueError("request_queue_url is required")
@@ -73,15 +209,45 @@ class SQSClient:
         self.request_queue_url = request_queue_url
         self.response_queue_url = response_queue_url
         self.region = region
+        self.request_fifo = request_queue_url.endswith(".fifo") if use_fifo is None else use_fifo
+        self.response_fifo = response_queue_url.endswith(".fifo") if use_fifo is None else use_fifo
+        self.secure_ids = secure_ids
+        self.hedge_receives = hedge_receives
+        self._poll_latency = _PollLatency()
         self._client: Optional[boto3.client] = None
 
     @property
     def client(self) -> boto3.client:
-        """Lazy-initialize the SQS client."""
+        """Lazy-initialize the SQS client, shared with other SQSClients in the region."""
         if self._client is None:
-            self._client = boto3.client("sqs", region_name=self.region)
+            self._client = _get_sqs_client(self.region)
         return self._client
 
+    def _send_params(self, message: dict) -> dict:
+        """
+        Return the SQS send parameters, other than the body, for a message.
+
+        The execution ID and operation are sent as message attributes
+        as well as in the body, so consumers can route and correlate a
+        request without parsing its JSON (the response path already
+        works this way).
+
+        On FIFO queues each request is its own message group, so the TWS
+        service can work on requests in parallel instead of strictly one
+        at a time, and the execution ID doubles as the deduplication ID.
+        """
+        execution_id = message["execution_id"]
+        params: dict[str, Any] = {
+            "MessageAttributes": {
+                "ExecutionId": {"DataType": "String", "StringValue": execution_id},
+                "Operation": {"DataType": "String", "StringValue": message["operation"]},
+            },
+        }
+        if self.request_fifo:
+            params["MessageGroupId"] = execution_id
+            params["MessageDeduplicationId"] = execution_id
+        return params
+
     def send_message(self, message: dict) -> dict:
         """
         Send a message to the request queue.
@@ -94,15 +260,72 @@ class SQSClient:
         """
         return self.client.send_message(
             QueueUrl=self.request_queue_url,
-            MessageBody=json.dumps(message),
+            MessageBody=_encode_body(message),
+            **self._send_params(message),
         )
 
+    def send_messages(self, messages: list[dict]) -> list[dict]:
+        """
+        Send messages to the request queue, up to 10 per SQS call.
+
+        Args:
+            messages: Message payloads to send
+
+        Returns:
+            SQS send_message_batch response for each chunk of messages
+
+        Raises:
+            SQSClientError: If any message in a batch could not be sent
+        """
+        responses = []
+        pending = iter(messages)
+        while chunk := list(itertools.islice(pending, MAX_BATCH_SIZE)):
+            response = self.client.send_message_batch(
+                QueueUrl=self.request_queue_url,
+                Entries=[
+                    {"Id": str(i), "MessageBody": _encode_body(message), **self._send_params(message)}
+                    for i, message in enumerate(chunk)
+                ],
+            )
+            failed = response.get("Failed", [])
+            if failed:
+                raise SQSClientError(f"Failed to send {len(failed)} batched request(s): {failed}")
+            responses.append(response)
+        return responses
+
+    async def send_messages_async(self, messages: list[dict]) -> list[dict]:
+        """Like send_messages(), but runs in a worker thread for async callers."""
+        return await asyncio.to_thread(self.send_messages, messages)
+
+    def _new_execution_id(self) -> str:
+        """Generate a unique execution ID for a request or batch."""
+        if self.secure_ids:
+            return str(uuid4())
+        return f"{_id_prefix}-{next(_id_counter)}"
+
+    def _build_request(
+        self,
+        operation: str,
+        execution_id: str,
+        params: Optional[dict] = None,
+        timestamp: Optional[str] = None,
+    ) -> dict:
+        """Build a request message for the TWS service."""
+        request = {
+            "operation": operation,
+            "execution_id": execution_id,
+            "timestamp": timestamp or datetime.now().isoformat(),
+        }
+        if params:
+            request.update(params)
+        return request
+
     def send_request(
         self,
         operation: str,
         params: Optional[dict] = None,
         timeout_minutes: int = 5,
-        wait_time_seconds: int = 3,
+        wait_time_seconds: int = LONG_POLL_SECONDS,
     ) -> dict:
         """
         Send a request to the TWS service and wait for response.
@@ -117,7 +340,7 @@ class SQSClient:
             operation: Operation name (e.g., "tws_health", "account_values")
             params: Optional parameters for the operation
             timeout_minutes: Maximum time to wait for response
-            wait_time_seconds: Time between polling attempts
+            wait_time_seconds: SQS long-polling wait time
 
         Returns:
             Response data from the TWS service
@@ -126,16 +349,8 @@ class SQSClient:
             SQSTimeoutError: If no response received within timeout
             SQSClientError: For other SQS-related errors
         """
-        execution_id = str(uuid4())
-        timestamp = datetime.now().isoformat()
-
-        request = {
-            "operation": operation,
-            "execution_id": execution_id,
-            "timestamp": timestamp,
-        }
-        if params:
-            request.update(params)
+        execution_id = self._new_execution_id()
+        request = self._build_request(operation, execution_id, params)
 
         logger.info(f"Sending request {execution_id} for operation '{operation}'")
 
@@ -151,11 +366,75 @@ class SQSClient:
             wait_time_seconds=wait_time_seconds,
         )
 
+    def submit_requests(self, requests: list[tuple[str, Optional[dict]]]) -> list[str]:
+        """
+        Send several requests in batched SQS calls without waiting for responses.
+
+        Each request gets its own execution ID sharing a per-batch prefix.
+
+        Args:
+            requests: (operation, params) pairs
+
+        Returns:
+            The execution ID of each request, in the same order
+
+        Raises:
+            SQSClientError: If the requests could not be sent
+        """
+        batch_id = self._new_execution_id()
+        execution_ids = [f"{batch_id}-{i}" for i in range(len(requests))]
+        timestamp = datetime.now().isoformat()
+        messages = [
+            self._build_request(operation, execution_id, params, timestamp)
+            for execution_id, (operation, params) in zip(execution_ids, requests)
+        ]
+
+        logger.info(f"Sending batch {batch_id} with {len(messages)} request(s)")
+
+        try:
+            self.send_messages(messages)
+        except ClientError as e:
+            raise SQSClientError(f"Failed to send batched requests: {e}") from e
+
+        return execution_ids
+
+    def send_requests(
+        self,
+        requests: list[tuple[str, Optional[dict]]],
+        timeout_minutes: int = 20,
+        wait_time_seconds: int = LONG_POLL_SECONDS,
+    ) -> list[dict]:
+        """
+        Send several requests in batched SQS calls and wait for all responses.
+
+        Responses are collected by a single polling loop and returned in
+        request order.
+
+        Args:
+            requests: (operation, params) pairs
+            timeout_minutes: Maximum time to wait for all responses
+            wait_time_seconds: SQS long-polling wait time
+
+        Returns:
+            Response data for each request, in the same order
+
+        Raises:
+            SQSTimeoutError: If any response is missing when the timeout is reached
+            SQSClientError: For other SQS-related errors
+        """
+        execution_ids = self.submit_requests(requests)
+        responses = self._wait_for_responses(
+            execution_ids=set(execution_ids),
+            timeout_minutes=timeout_minutes,
+            wait_time_seconds=wait_time_seconds,
+        )
+        return [responses[execution_id] for execution_id in execution_ids]
+
     def _wait_for_response(
         self,
         execution_id: str,
         timeout_minutes: int = 5,
-        wait_time_seconds: int = 3,
+        wait_time_seconds: int = LONG_POLL_SECONDS,
     ) -> dict:
         """
         Wait for and retrieve a response matching the execution ID.
@@ -171,81 +450,209 @@ class SQSClient:
         Raises:
             SQSTimeoutError: If timeout is reached
         """
-        start_time = datetime.now()
-        timeout = start_time + timedelta(minutes=timeout_minutes)
-        poll_delay = 0.5  # Start with short delay, use exponential backoff
+        responses = self._wait_for_responses(
+            execution_ids={execution_id},
+            timeout_minutes=timeout_minutes,
+            wait_time_seconds=wait_time_seconds,
+        )
+        return responses[execution_id]
 
-        while datetime.now() < timeout:
-            try:
-                response = self.client.receive_message(
-                    QueueUrl=self.response_queue_url,
-                    MaxNumberOfMessages=10,
-                    WaitTimeSeconds=wait_time_seconds,
-                    MessageAttributeNames=["ExecutionId"],
-                )
-            except ClientError as e:
-                logger.warning(f"Error receiving message: {e}")
-                time.sleep(poll_delay)
-                poll_delay = min(poll_delay * 1.5, 5.0)
-                continue
+    def _wait_for_responses(
+        self,
+        execution_ids: set[str],
+        timeout_minutes: int = 5,
+        wait_time_seconds: int = LONG_POLL_SECONDS,
+    ) -> dict[str, dict]:
+        """
+        Wait for and retrieve responses matching a set of execution IDs.
 
-            messages = response.get("Messages", [])
-            if not messages:
-                time.sleep(min(poll_delay, 5.0))
-                poll_delay = min(poll_delay * 1.5, 5.0)
-                continue
+        Args:
+            execution_ids: Unique IDs to match requests with responses
+            timeout_minutes: Maximum time to wait for all of them
+            wait_time_seconds: SQS long-polling wait time
 
-            matching_message = None
-            for message in messages:
-                msg_execution_id = (
-                    message.get("MessageAttributes", {})
-                    .get("ExecutionId", {})
-                    .get("StringValue")
-                )
+        Returns:
+            Mapping of execution ID to response data
+
+        Raises:
+            SQSTimeoutError: If timeout is reached before every response arrives
+        """
+        pending = set(execution_ids)
+        responses: dict[str, dict] = {}
+        # Monotonic, so the timeout is immune to wall-clock changes
+        deadline = time.monotonic() + timeout_minutes * 60
+        error_delay = 0.5  # Back off only when SQS itself errors (e.g. throttling)
+        # Running polls -> monotonic start time. A second poll is only
+        # started to hedge a straggling first one, at most once per wait.
+        polls: dict[Future, float] = {}
+        can_hedge = self.hedge_receives
+
+        # Each receive blocks server-side until a message arrives or the
+        # long-poll expires, so no sleeping is needed between polls
+        while (remaining := deadline - time.monotonic()) > 0:
+            poll_wait = min(wait_time_seconds, max(int(remaining), 1))
+            if not polls:
+                polls[self._start_poll(pending, poll_wait)] = time.monotonic()
+
+            hedge_at = self._hedge_deadline(polls) if can_hedge else None
+            done, _ = wait(
+                polls,
+                timeout=remaining if hedge_at is None else max(hedge_at - time.monotonic(), 0),
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                if hedge_at is not None:
+                    logger.info("Poll is taking longer than usual; starting a hedged receive")
+                    polls[self._start_poll(pending, poll_wait)] = time.monotonic()
+                    can_hedge = False
+                continue
 
-                if msg_execution_id == execution_id:
-                    matching_message = message
-                else:
-                    # Return non-matching messages to the queue
-                    try:
-                        self.client.change_message_visibility(
-                            QueueUrl=self.response_queue_url,
-                            ReceiptHandle=message["ReceiptHandle"],
-                            VisibilityTimeout=0,
-                        )
-                    except ClientError:
-                        pass  # Best effort
-
-            if matching_message:
+            for future in done:
+                poll_started = polls.pop(future)
                 try:
-                    response_data = json.loads(matching_message["Body"])
-                    # Delete the processed message
-                    self.client.delete_message(
-                        QueueUrl=self.response_queue_url,
-                        ReceiptHandle=matching_message["ReceiptHandle"],
-                    )
-                    logger.info(f"Received response for {execution_id}")
-                    return response_data
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Invalid JSON in response: {e}")
-                    # Return malformed message to queue
-                    try:
-                        self.client.change_message_visibility(
-                            QueueUrl=self.response_queue_url,
-                            ReceiptHandle=matching_message["ReceiptHandle"],
-                            VisibilityTimeout=0,
-                        )
-                    except ClientError:
-                        pass
-
-            # Exponential backoff
-            time.sleep(min(poll_delay, 5.0))
-            poll_delay = min(poll_delay * 1.5, 5.0)
+                    received = future.result()
+                except ClientError as e:
+                    logger.warning(f"Error receiving message: {e}")
+                    time.sleep(error_delay)
+                    error_delay = min(error_delay * 1.5, 5.0)
+                    continue
+
+                error_delay = 0.5
+                if not received and not polls and time.monotonic() - poll_started < 1.0:
+                    time.sleep(FOREIGN_MESSAGE_BACKOFF_SECONDS)
+                responses.update(received)
+                pending.difference_update(received)
+
+            if not pending:
+                return responses
 
         raise SQSTimeoutError(
-            f"Timeout waiting for response. Execution ID: {execution_id}"
+            f"Timeout waiting for response. Execution ID(s): {', '.join(sorted(pending))}"
         )
 
+    def _start_poll(self, execution_ids: Container[str], wait_time_seconds: int) -> Future:
+        """
+        Run receive_responses() in a background thread.
+
+        A daemon thread rather than an executor, so a hedged poll that
+        lost the race never holds up interpreter exit.
+        """
+        future: Future = Future()
+
+        def run() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(self.receive_responses(execution_ids, wait_time_seconds))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name="sqs-receive", daemon=True).start()
+        return future
+
+    def _hedge_deadline(self, polls: dict[Any, float]) -> Optional[float]:
+        """
+        Monotonic time at which to hedge the single running poll, if any.
+
+        Only a lone poll is hedged, so at most two polls ever race.
+        """
+        delay = self.hedge_delay()
+        if delay is None or len(polls) != 1:
+            return None
+        return next(iter(polls.values())) + delay
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        Seconds after which a running poll should be hedged with a second one.
+
+        Returns None if hedging is disabled or no response has been
+        received yet to learn the usual latency from.
+        """
+        if not self.hedge_receives:
+            return None
+        return self._poll_latency.hedge_delay()
+
+    def receive_responses(
+        self,
+        execution_ids: Container[str],
+        wait_time_seconds: int = LONG_POLL_SECONDS,
+    ) -> dict[str, dict]:
+        """
+        Poll the response queue once and collect responses for execution_ids.
+
+        Matching messages are deleted; any others are released back to
+        the queue for their own consumers. execution_ids is only tested
+        for membership, so the caller may keep adding to it while a poll
+        is in progress.
+
+        Args:
+            execution_ids: IDs of the requests awaiting a response
+            wait_time_seconds: SQS long-polling wait time
+
+        Returns:
+            Mapping of execution ID to response data for the responses received
+
+        Raises:
+            ClientError: If the receive call fails
+        """
+        poll_started = time.monotonic()
+        fifo_params = {}
+        if self.response_fifo:
+            # Lets SQS hand back the same messages if botocore retries this call
+            fifo_params["ReceiveRequestAttemptId"] = str(uuid4())
+
+        response = self.client.receive_message(
+            QueueUrl=self.response_queue_url,
+            MaxNumberOfMessages=10,
+            WaitTimeSeconds=wait_time_seconds,
+            MessageAttributeNames=["ExecutionId"],
+            **fifo_params,
+        )
+
+        received: dict[str, dict] = {}
+        for message in response.get("Messages", []):
+            msg_execution_id = (
+                message.get("MessageAttributes", {})
+                .get("ExecutionId", {})
+                .get("StringValue")
+            )
+
+            if msg_execution_id not in execution_ids:
+                # Return non-matching messages to the queue
+                self._release_message(message)
+                continue
+
+            try:
+                response_data = _decode_body(message["Body"])
+            except json.JSONDecodeError as e:
+                logger.warning(f"Invalid JSON in response: {e}")
+                # Return malformed message to queue
+                self._release_message(message)
+                continue
+
+            # Delete the processed message
+            self.client.delete_message(
+                QueueUrl=self.response_queue_url,
+                ReceiptHandle=message["ReceiptHandle"],
+            )
+            logger.info(f"Received response for {msg_execution_id}")
+            received[msg_execution_id] = response_data
+
+        if received:
+            self._poll_latency.observe(time.monotonic() - poll_started)
+        return received
+
+    def _release_message(self, message: dict) -> None:
+        """Make a received message immediately visible to other consumers."""
+        try:
+            self.client.change_message_visibility(
+                QueueUrl=self.response_queue_url,
+                ReceiptHandle=message["ReceiptHandle"],
+                VisibilityTimeout=0,
+            )
+        except ClientError:
+            pass  # Best effort
+
     # Convenience methods for specific operations
 
     def health_check(self, timeout_minutes: int = 2) -> dict:
@@ -322,3 +729,166 @@ class SQSClient:
             },
             timeout_minutes=timeout_minutes,
         )
+
+    def custom_ohlcv_parallel(
+        self,
+        symbols: list[dict],
+        duration_str: str = "7 D",
+        bar_size_setting: str = "1 day",
+        timeout_minutes: int = 20,
+    ) -> list[dict]:
+        """
+        Get custom OHLCV data with one request per symbol.
+
+        The per-symbol requests are sent together and their responses
+        collected by one polling loop, so a TWS service running several
+        workers can fetch the symbols in parallel instead of one after
+        another inside a single request.
+
+        Args:
+            symbols: List of symbol dicts, as for custom_ohlcv()
+            duration_str: Duration string (e.g., "7 D", "1 M")
+            bar_size_setting: Bar size (e.g., "1 day", "1 hour")
+            timeout_minutes: Maximum time to wait for all responses
+
+        Returns:
+            The response for each symbol, in the same order as symbols
+        """
+        return self.send_requests(
+            [
+                (
+                    "ohlcv",
+                    {
+                        "symbols": [symbol],
+                        "duration_str": duration_str,
+                        "bar_size_setting": bar_size_setting,
+                    },
+                )
+                for symbol in symbols
+            ],
+            timeout_minutes=timeout_minutes,
+        )
+
+
+class AsyncSQSClient:
+    """
+    Awaitable interface to the TWS service for use inside an event loop.
+
+    Wraps an SQSClient: each blocking SQS call runs in a worker thread,
+    and waits between polls use asyncio.sleep, so a 20 s long-poll never
+    blocks other tool calls. (aiobotocore would avoid the threads, but it
+    pins botocore to versions that conflict with boto3.)
+
+    Usage:
+        client = AsyncSQSClient(SQSClient(request_queue_url, response_queue_url))
+        response = await client.send_request("tws_health")
+    """
+
+    def __init__(self, sync_client: SQSClient):
+        """
+        Initialize the async client.
+
+        Args:
+            sync_client: SQS client that performs the underlying calls
+        """
+        self.sync_client = sync_client
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds after which to hedge a running poll; see SQSClient.hedge_delay()."""
+        return self.sync_client.hedge_delay()
+
+    async def submit_requests(self, requests: list[tuple[str, Optional[dict]]]) -> list[str]:
+        """Send requests in batched SQS calls; see SQSClient.submit_requests()."""
+        return await asyncio.to_thread(self.sync_client.submit_requests, requests)
+
+    async def receive_responses(
+        self,
+        execution_ids: Container[str],
+        wait_time_seconds: int = LONG_POLL_SECONDS,
+    ) -> dict[str, dict]:
+        """Poll the response queue once; see SQSClient.receive_responses()."""
+        return await asyncio.to_thread(
+            self.sync_client.receive_responses, execution_ids, wait_time_seconds
+        )
+
+    async def send_request(
+        self,
+        operation: str,
+        params: Optional[dict] = None,
+        timeout_minutes: int = 5,
+        wait_time_seconds: int = LONG_POLL_SECONDS,
+    ) -> dict:
+        """
+        Send a request to the TWS service and wait for response.
+
+        Args:
+            operation: Operation name (e.g., "tws_health", "account_values")
+            params: Optional parameters for the operation
+            timeout_minutes: Maximum time to wait for response
+            wait_time_seconds: SQS long-polling wait time
+
+        Returns:
+            Response data from the TWS service
+
+        Raises:
+            SQSTimeoutError: If no response received within timeout
+            SQSClientError: For other SQS-related errors
+        """
+        responses = await self.send_requests(
+            [(operation, params)],
+            timeout_minutes=timeout_minutes,
+            wait_time_seconds=wait_time_seconds,
+        )
+        return responses[0]
+
+    async def send_requests(
+        self,
+        requests: list[tuple[str, Optional[dict]]],
+        timeout_minutes: int = 20,
+        wait_time_seconds: int = LONG_POLL_SECONDS,
+    ) -> list[dict]:
+        """
+        Send several requests in batched SQS calls and wait for all responses.
+
+        Args:
+            requests: (operation, params) pairs
+            timeout_minutes: Maximum time to wait for all responses
+            wait_time_seconds: SQS long-polling wait time
+
+        Returns:
+            Response data for each request, in the same order
+
+        Raises:
+            SQSTimeoutError: If any response is missing when the timeout is reached
+            SQSClientError: For other SQS-related errors
+        """
+        execution_ids = await self.submit_requests(requests)
+        pending = set(execution_ids)
+        responses: dict[str, dict] = {}
+        deadline = time.monotonic() + timeout_minutes * 60
+        error_delay = 0.5
+
+        while (remaining := deadline - time.monotonic()) > 0:
+            poll_started = time.monotonic()
+            try:
+                received = await self.receive_responses(
+                    pending, min(wait_time_seconds, max(int(remaining), 1))
+                )
+            except ClientError as e:
+                logger.warning(f"Error receiving message: {e}")
+                await asyncio.sleep(error_delay)
+                error_delay = min(error_delay * 1.5, 5.0)
+                continue
+
+            error_delay = 0.5
+            if not received and time.monotonic() - poll_started < 1.0:
+                await asyncio.sleep(FOREIGN_MESSAGE_BACKOFF_SECONDS)
+            responses.update(received)
+            pending.difference_update(received)
+
+            if not pending:
+                return [responses[execution_id] for execution_id in execution_ids]
+
+        raise SQSTimeoutError(
+            f"Timeout waiting for response. Execution ID(s): {', '.join(sorted(pending))}"
+        )
@@ -0,0 +1,79 @@
+"""Shared fixtures: SQS queues backed by moto."""
+
+import json
+import threading
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from ibkr_mcp import sqs_client
+
+REGION = "us-west-2"
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    """Mock AWS, with fresh shared SQS clients so none outlive the mock."""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", REGION)
+    monkeypatch.setattr(sqs_client, "_session", None)
+    monkeypatch.setattr(sqs_client, "_clients", {})
+    with mock_aws():
+        yield boto3.client("sqs", region_name=REGION)
+
+
+def create_queue(sqs, name: str) -> str:
+    """Create a standard queue, or a FIFO queue if name ends in .fifo."""
+    attributes = {"FifoQueue": "true"} if name.endswith(".fifo") else {}
+    return sqs.create_queue(QueueName=name, Attributes=attributes)["QueueUrl"]
+
+
+class EchoService:
+    """
+    Stands in for the TWS service: answers each request on the request
+    queue with a response carrying its ExecutionId attribute.
+    """
+
+    def __init__(self, sqs, request_queue_url: str, response_queue_url: str):
+        self.sqs = sqs
+        self.request_queue_url = request_queue_url
+        self.response_queue_url = response_queue_url
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> "EchoService":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            messages = self.sqs.receive_message(
+                QueueUrl=self.request_queue_url,
+                MaxNumberOfMessages=10,
+                WaitTimeSeconds=0,
+                MessageAttributeNames=["All"],
+            ).get("Messages", [])
+            for message in messages:
+                request = json.loads(message["Body"])
+                self.sqs.send_message(
+                    QueueUrl=self.response_queue_url,
+                    MessageBody=json.dumps({"status": "success", "request": request}),
+                    MessageAttributes={
+                        "ExecutionId": {
+                            "DataType": "String",
+                            "StringValue": request["execution_id"],
+                        },
+                    },
+                )
+                self.sqs.delete_message(
+                    QueueUrl=self.request_queue_url,
+                    ReceiptHandle=message["ReceiptHandle"],
+                )
+            if not messages:
+                self._stop.wait(0.01)
@@ -0,0 +1,280 @@
+"""Tests for request coalescing."""
+
+import asyncio
+import time
+
+import pytest
+
+from ibkr_mcp.coalescer import RequestCoalescer
+from ibkr_mcp.sqs_client import AsyncSQSClient, SQSClient, SQSTimeoutError
+
+from .conftest import REGION, EchoService, create_queue
+
+
+class FakeClient:
+    """Stands in for AsyncSQSClient, with responses supplied by the test."""
+
+    def __init__(self, auto_respond: bool = True, hedge_delay: float | None = None):
+        self.auto_respond = auto_respond
+        self._hedge_delay = hedge_delay
+        self.batches: list[list[tuple]] = []
+        self.polls = 0
+        # Execution ID -> response waiting to be received
+        self.ready: dict[str, dict] = {}
+
+    async def submit_requests(self, requests):
+        first = sum(len(batch) for batch in self.batches)
+        execution_ids = [f"id-{first + i}" for i in range(len(requests))]
+        self.batches.append(list(requests))
+        if self.auto_respond:
+            for execution_id, (operation, params) in zip(execution_ids, requests):
+                self.respond(execution_id, {"operation": operation, "params": params})
+        return execution_ids
+
+    async def receive_responses(self, execution_ids, wait_time_seconds):
+        self.polls += 1
+        deadline = time.monotonic() + wait_time_seconds
+        while True:
+            received = {
+                execution_id: self.ready.pop(execution_id)
+                for execution_id in list(self.ready)
+                if execution_id in execution_ids
+            }
+            if received or time.monotonic() >= deadline:
+                return received
+            await asyncio.sleep(0.005)
+
+    def respond(self, execution_id: str, response: dict) -> None:
+        self.ready[execution_id] = response
+
+    def hedge_delay(self):
+        return self._hedge_delay
+
+
+class DuplicatingClient(FakeClient):
+    """Returns every response from every poll; the first poll straggles."""
+
+    async def receive_responses(self, execution_ids, wait_time_seconds):
+        self.polls += 1
+        poll = self.polls
+        if poll == 1:
+            await asyncio.sleep(0.2)
+        # Ignores execution_ids, as a redelivered message would
+        return {
+            execution_id: {"poll": poll}
+            for batch_start, batch in self._sent()
+            for execution_id in (f"id-{batch_start + i}" for i in range(len(batch)))
+        }
+
+    def _sent(self):
+        start = 0
+        for batch in self.batches:
+            yield start, batch
+            start += len(batch)
+
+
+class TestBatching:
+    """Tests for collecting requests into batches."""
+
+    @pytest.mark.asyncio
+    async def test_requests_within_window_share_a_batch(self):
+        """Requests submitted within the window are sent together."""
+        client = FakeClient()
+        coalescer = RequestCoalescer(client, window_seconds=0.05, wait_time_seconds=1)
+
+        first = asyncio.create_task(coalescer.submit("tws_health"))
+        await asyncio.sleep(0.01)
+        results = await asyncio.gather(
+            first,
+            coalescer.submit("find_symbols", {"query": "AAPL"}),
+            coalescer.submit("raw_positions"),
+        )
+
+        assert len(client.batches) == 1
+        assert [r["operation"] for r in results] == ["tws_health", "find_symbols", "raw_positions"]
+
+    @pytest.mark.asyncio
+    async def test_requests_after_window_get_a_new_batch(self):
+        """A request submitted after a flush goes out in the next batch."""
+        client = FakeClient()
+        coalescer = RequestCoalescer(client, window_seconds=0.01, wait_time_seconds=1)
+
+        await coalescer.submit("tws_health")
+        await coalescer.submit("raw_positions")
+
+        assert client.batches == [[("tws_health", None)], [("raw_positions", None)]]
+
+    @pytest.mark.asyncio
+    async def test_large_batch_is_chunked(self, aws, monkeypatch):
+        """More than 10 requests take several SendMessageBatch calls, one wait."""
+        request_url = create_queue(aws, "requests")
+        response_url = create_queue(aws, "responses")
+        sync_client = SQSClient(request_url, response_url, region=REGION)
+        batch_sizes = []
+        send_message_batch = sync_client.client.send_message_batch
+
+        def counting_send(**kwargs):
+            batch_sizes.append(len(kwargs["Entries"]))
+            return send_message_batch(**kwargs)
+
+        monkeypatch.setattr(sync_client.client, "send_message_batch", counting_send)
+        coalescer = RequestCoalescer(
+            AsyncSQSClient(sync_client), window_seconds=0.01, wait_time_seconds=1
+        )
+
+        with EchoService(aws, request_url, response_url):
+            results = await asyncio.gather(*(
+                coalescer.submit("find_symbols", {"query": f"SYM{i}"}) for i in range(15)
+            ))
+
+        assert batch_sizes == [10, 5]
+        assert [r["request"]["query"] for r in results] == [f"SYM{i}" for i in range(15)]
+
+
+class TestRouting:
+    """Tests for handing responses back to their callers."""
+
+    @pytest.mark.asyncio
+    async def test_responses_reach_their_own_caller(self):
+        """Responses arriving out of order go to the matching request."""
+        client = FakeClient(auto_respond=False)
+        coalescer = RequestCoalescer(client, window_seconds=0.01, wait_time_seconds=1)
+
+        tasks = [
+            asyncio.create_task(coalescer.submit("find_symbols", {"query": q}))
+            for q in ("AAPL", "MSFT", "GOOG")
+        ]
+        await asyncio.sleep(0.05)
+        for execution_id in ("id-2", "id-0", "id-1"):
+            client.respond(execution_id, {"answered": execution_id})
+            await asyncio.sleep(0.02)
+
+        results = await asyncio.gather(*tasks)
+        assert results == [{"answered": "id-0"}, {"answered": "id-1"}, {"answered": "id-2"}]
+
+    @pytest.mark.asyncio
+    async def test_unknown_responses_are_ignored(self):
+        """A response for an ID nobody waits on doesn't disturb the others."""
+        client = FakeClient(auto_respond=False)
+        coalescer = RequestCoalescer(client, window_seconds=0.01, wait_time_seconds=1)
+
+        task = asyncio.create_task(coalescer.submit("tws_health"))
+        await asyncio.sleep(0.05)
+        client.respond("someone-else", {"stray": True})
+        client.respond("id-0", {"status": "success"})
+
+        assert await task == {"status": "success"}
+
+
+class TestCleanup:
+    """Tests for releasing requests that are no longer waited on."""
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_is_dropped(self):
+        """Cancelling a caller stops the loop waiting on its response."""
+        client = FakeClient(auto_respond=False)
+        coalescer = RequestCoalescer(client, window_seconds=0.01, wait_time_seconds=1)
+
+        task = asyncio.create_task(coalescer.submit("daily_ohlcv"))
+        await asyncio.sleep(0.05)
+        assert "id-0" in coalescer._waiting
+        task.cancel()
+
+        await asyncio.wait_for(coalescer._receive_task, timeout=2)
+        assert not coalescer._waiting
+
+    @pytest.mark.asyncio
+    async def test_receive_loop_stops_after_timeouts(self):
+        """Once every request has timed out, the loop exits."""
+        client = FakeClient(auto_respond=False)
+        coalescer = RequestCoalescer(client, window_seconds=0.01, wait_time_seconds=1)
+
+        results = await asyncio.gather(
+            coalescer.submit("tws_health", timeout_minutes=0.001),
+            coalescer.submit("raw_positions", timeout_minutes=0.001),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, SQSTimeoutError) for r in results)
+        await asyncio.wait_for(coalescer._receive_task, timeout=2)
+        assert not coalescer._waiting
+
+    @pytest.mark.asyncio
+    async def test_send_failure_fails_every_caller(self):
+        """If the batch can't be sent, each caller in it gets the error."""
+        client = FakeClient()
+
+        async def fail(requests):
+            raise RuntimeError("send failed")
+
+        client.submit_requests = fail
+        coalescer = RequestCoalescer(client, window_seconds=0.01, wait_time_seconds=1)
+
+        results = await asyncio.gather(
+            coalescer.submit("tws_health"),
+            coalescer.submit("raw_positions"),
+            return_exceptions=True,
+        )
+
+        assert [str(r) for r in results] == ["send failed", "send failed"]
+        assert not coalescer._waiting
+
+
+class TestHedging:
+    """Tests for racing a second poll against a straggling one."""
+
+    @pytest.mark.asyncio
+    async def test_hedged_poll_delivers_each_response_once(self):
+        """The hedge answers first; the straggler's duplicate is dropped."""
+        client = DuplicatingClient(auto_respond=False, hedge_delay=0.02)
+        coalescer = RequestCoalescer(client, window_seconds=0.01, wait_time_seconds=1)
+
+        result = await coalescer.submit("tws_health")
+        await asyncio.wait_for(coalescer._receive_task, timeout=2)
+
+        assert result == {"poll": 2}
+        assert client.polls == 2
+        assert not coalescer._waiting
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_latency_estimate(self):
+        """Without a usual latency to compare to, polls aren't hedged."""
+        client = DuplicatingClient(auto_respond=False, hedge_delay=None)
+        coalescer = RequestCoalescer(client, window_seconds=0.01, wait_time_seconds=1)
+
+        assert await coalescer.submit("tws_health") == {"poll": 1}
+        assert client.polls == 1
+
+
+class TestTimeouts:
+    """Tests for per-request timeouts."""
+
+    @pytest.mark.asyncio
+    async def test_each_request_has_its_own_timeout(self):
+        """A short timeout expires without waiting out a long-poll or its batch."""
+        client = FakeClient(auto_respond=False)
+        coalescer = RequestCoalescer(client, window_seconds=0.01, wait_time_seconds=1)
+
+        start = time.monotonic()
+        quick = asyncio.create_task(coalescer.submit("tws_health", timeout_minutes=0.001))
+        slow = asyncio.create_task(coalescer.submit("daily_ohlcv", timeout_minutes=1))
+
+        with pytest.raises(SQSTimeoutError):
+            await quick
+        assert time.monotonic() - start < 0.5
+
+        client.respond("id-1", {"status": "success"})
+        assert await slow == {"status": "success"}
+        assert len(client.batches) == 1
+
+    @pytest.mark.asyncio
+    async def test_default_timeout_applies(self):
+        """Requests without a timeout use the coalescer's."""
+        client = FakeClient(auto_respond=False)
+        coalescer = RequestCoalescer(
+            client, window_seconds=0.01, timeout_minutes=0.001, wait_time_seconds=1
+        )
+
+        with pytest.raises(SQSTimeoutError):
+            await coalescer.submit("tws_health")
+        assert not coalescer._waiting
@@ -0,0 +1,62 @@
+"""Tests for the MCP server's tool dispatch."""
+
+import pytest
+
+from ibkr_mcp.server import run_batch
+from ibkr_mcp.sqs_client import SQSTimeoutError
+
+
+class FakeCoalescer:
+    """Answers each operation from a table, raising any exception found there."""
+
+    def __init__(self, outcomes: dict):
+        self.outcomes = outcomes
+        self.submitted = []
+
+    async def submit(self, operation, params=None, timeout_minutes=None):
+        self.submitted.append((operation, timeout_minutes))
+        outcome = self.outcomes[operation]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class TestRunBatch:
+    """Tests for ibkr_batch."""
+
+    @pytest.mark.asyncio
+    async def test_failed_call_does_not_discard_others(self):
+        """Each sub-call reports its own status."""
+        coalescer = FakeCoalescer({
+            "raw_positions": {"positions": []},
+            "tws_health": SQSTimeoutError("no response"),
+        })
+
+        result = await run_batch(coalescer, {"calls": [
+            {"tool": "ibkr_positions"},
+            {"tool": "ibkr_health"},
+            {"tool": "ibkr_search_symbols", "arguments": {}},
+        ]})
+
+        positions, health, search = result["results"]
+        assert positions == {
+            "tool": "ibkr_positions",
+            "status": "ok",
+            "result": {"positions": []},
+        }
+        assert health["status"] == "error"
+        assert "Request timed out" in health["error"]
+        assert search["status"] == "error"
+        assert "'query' parameter is required" in search["error"]
+
+    @pytest.mark.asyncio
+    async def test_sub_calls_keep_their_timeouts(self):
+        """Batched calls wait as long as the same tools called alone."""
+        coalescer = FakeCoalescer({"tws_health": {}, "daily_ohlcv": {}})
+
+        await run_batch(coalescer, {"calls": [
+            {"tool": "ibkr_health"},
+            {"tool": "ibkr_daily_ohlcv"},
+        ]})
+
+        assert coalescer.submitted == [("tws_health", 2), ("daily_ohlcv", 20)]
@@ -0,0 +1,122 @@
+"""Tests for the SQS client, against queues mocked with moto."""
+
+import json
+
+import pytest
+
+from ibkr_mcp.sqs_client import SQSClient
+
+from .conftest import REGION, create_queue
+
+
+def receive_all(sqs, queue_url: str) -> list[dict]:
+    """Receive every message on a queue, with all of its attributes."""
+    return sqs.receive_message(
+        QueueUrl=queue_url,
+        MaxNumberOfMessages=10,
+        AttributeNames=["All"],
+        MessageAttributeNames=["All"],
+    ).get("Messages", [])
+
+
+def attribute(message: dict, name: str) -> str:
+    """Return a message attribute's string value."""
+    return message["MessageAttributes"][name]["StringValue"]
+
+
+@pytest.fixture(params=["requests", "requests.fifo"])
+def request_queue(request, aws):
+    """A standard request queue, then a FIFO one."""
+    return create_queue(aws, request.param)
+
+
+@pytest.fixture
+def client(aws, request_queue):
+    response_queue = create_queue(aws, "responses")
+    return SQSClient(request_queue, response_queue, region=REGION)
+
+
+class TestSend:
+    """Tests for the parameters requests are sent with."""
+
+    def test_fifo_params_only_on_fifo_queues(self, client, monkeypatch):
+        """Group and deduplication IDs are set for .fifo queues alone."""
+        sent = []
+        send_message = client.client.send_message
+
+        def recording_send(**kwargs):
+            sent.append(kwargs)
+            return send_message(**kwargs)
+
+        monkeypatch.setattr(client.client, "send_message", recording_send)
+        client.send_message({"operation": "tws_health", "execution_id": "abc-1"})
+
+        if client.request_queue_url.endswith(".fifo"):
+            assert sent[0]["MessageGroupId"] == "abc-1"
+            assert sent[0]["MessageDeduplicationId"] == "abc-1"
+        else:
+            assert "MessageGroupId" not in sent[0]
+            assert "MessageDeduplicationId" not in sent[0]
+
+    def test_attributes_round_trip(self, aws, client):
+        """Batched requests arrive with their execution ID and operation."""
+        execution_ids = client.submit_requests([
+            ("tws_health", None),
+            ("find_symbols", {"query": "AAPL"}),
+        ])
+
+        messages = receive_all(aws, client.request_queue_url)
+        by_id = {attribute(m, "ExecutionId"): m for m in messages}
+        assert set(by_id) == set(execution_ids)
+        for execution_id, operation in zip(execution_ids, ["tws_health", "find_symbols"]):
+            message = by_id[execution_id]
+            assert attribute(message, "Operation") == operation
+            assert json.loads(message["Body"])["execution_id"] == execution_id
+            if client.request_fifo:
+                assert message["Attributes"]["MessageGroupId"] == execution_id
+                assert message["Attributes"]["MessageDeduplicationId"] == execution_id
+
+    def test_large_batch_is_chunked(self, aws, client):
+        """Requests beyond SQS's batch limit go out in further calls."""
+        responses = client.send_messages([
+            {"operation": "tws_health", "execution_id": f"abc-{i}"} for i in range(12)
+        ])
+
+        assert [len(r["Successful"]) for r in responses] == [10, 2]
+
+
+class TestReceive:
+    """Tests for collecting responses from the response queue."""
+
+    def respond(self, aws, client, execution_id: str, body: dict) -> None:
+        aws.send_message(
+            QueueUrl=client.response_queue_url,
+            MessageBody=json.dumps(body),
+            MessageAttributes={
+                "ExecutionId": {"DataType": "String", "StringValue": execution_id},
+            },
+        )
+
+    def test_matching_responses_are_consumed(self, aws, client):
+        """Responses for our IDs are returned and deleted; others are left."""
+        self.respond(aws, client, "ours", {"status": "success"})
+        self.respond(aws, client, "theirs", {"status": "success"})
+
+        received = client.receive_responses({"ours"}, wait_time_seconds=0)
+
+        assert received == {"ours": {"status": "success"}}
+        remaining = receive_all(aws, client.response_queue_url)
+        assert [attribute(m, "ExecutionId") for m in remaining] == ["theirs"]
+
+    def test_response_matches_request_attribute(self, aws, client):
+        """The ExecutionId sent with a request correlates its response."""
+        self.respond(aws, client, "stale", {"status": "stale"})
+
+        execution_id = client.submit_requests([("tws_health", None)])[0]
+        (message,) = receive_all(aws, client.request_queue_url)
+        self.respond(aws, client, attribute(message, "ExecutionId"), {"status": "success"})
+
+        received = client._wait_for_response(
+            execution_id, timeout_minutes=0.05, wait_time_seconds=0
+        )
+        assert received == {"status": "success"}
@@ -0,0 +1,126 @@
+"""Response caching for the 1Password MCP server.
+
+A small TTL + LRU cache for read-only SDK results, so repeated reads
+within a session don't each make a network round-trip.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Least-recently-used cache whose entries expire after a fixed TTL.
+
+    A ttl of 0 (or less) disables caching: set() is a no-op and get()
+    always misses.
+    """
+
+    __slots__ = ("maxsize", "ttl", "_entries", "_locks", "_lock_users")
+
+    def __init__(self, maxsize: int = 512, ttl: float = 60.0):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries before the oldest is evicted.
+            ttl: Seconds an entry stays valid after it is stored.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (expiry on the monotonic clock, value); oldest first
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        # Per-key locks held while a missing value is fetched, and how many
+        # callers hold or wait on each; a lock is dropped when none do
+        self._locks: dict[Hashable, asyncio.Lock] = {}
+        self._lock_users: dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        expires, value = entry
+        if time.monotonic() >= expires:
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Store value under key, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key.
+            value: Value to store.
+            ttl: Seconds the entry stays valid; defaults to the cache's ttl.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_set(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: float | None = None,
+    ) -> Any:
+        """Return the cached value for key, awaiting fetch() to fill a miss.
+
+        Concurrent misses for the same key wait on a per-key lock, so
+        fetch() runs once and the other callers get its result from the
+        cache. Errors are not cached.
+
+        Args:
+            key: Cache key.
+            fetch: Coroutine function producing the value.
+            ttl: Seconds the fetched value stays valid; defaults to the cache's ttl.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if (self.ttl if ttl is None else ttl) <= 0:
+            # Nothing would be stored, so waiting on the lock gains nothing
+            return await fetch()
+
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        self._lock_users[key] = self._lock_users.get(key, 0) + 1
+        try:
+            async with lock:
+                value = self.get(key, _MISSING)
+                if value is _MISSING:
+                    value = await fetch()
+                    self.set(key, value, ttl)
+                return value
+        finally:
+            # lock.locked() is briefly False while queued callers are still
+            # waiting, so count them rather than dropping the lock early
+            remaining = self._lock_users[key] - 1
+            if remaining:
+                self._lock_users[key] = remaining
+            else:
+                del self._lock_users[key]
+                del self._locks[key]
+
+    def discard(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Remove every entry whose key matches predicate."""
+        for key in [k for k in self._entries if predicate(k)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
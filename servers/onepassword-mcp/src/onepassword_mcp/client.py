@@ -3,16 +3,40 @@
 Wraps the official 1Password SDK with vault filtering and error handling.
 """
 
+import asyncio
+import hashlib
 import logging
 import os
-from typing import Any
+import re
+import time
+from collections import defaultdict
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar
 
 from onepassword import Client
 
+from .cache import TTLCache
 from .security import FieldRedactor, VaultFilter
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Seconds to reuse list_vaults / list_items / get_item results
+DEFAULT_CACHE_TTL = 60.0
+
+# Minimum seconds between vault list refreshes triggered by unknown vault IDs
+VAULT_REFRESH_INTERVAL = 300.0
+
+# op://vault/item/field or op://vault/item/section/field
+_SECRET_REFERENCE_RE = re.compile(
+    r"op://(?P<vault>[^/]+)/(?P<item>[^/]+)/(?P<field>.+)", re.DOTALL
+)
+
+# Authenticated SDK clients shared by every OnePasswordClient in the process,
+# keyed by a hash of the service account token (never the token itself)
+_CLIENT_POOL: dict[str, Client] = {}
+_CLIENT_LOCKS: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
 
 class OnePasswordClientError(Exception):
     """Error from 1Password client operations."""
@@ -23,10 +47,25 @@ class OnePasswordClientError(Exception):
 class OnePasswordClient:
     """Wrapper around 1Password SDK with security filtering."""
 
+    __slots__ = (
+        "_token",
+        "_client",
+        "_pool_key",
+        "_vault_filter",
+        "_field_redactor",
+        "_vault_cache",
+        "_vault_cache_lower",
+        "_allowed_vault_ids",
+        "_vault_refreshed_at",
+        "_inflight",
+        "_response_cache",
+    )
+
     def __init__(
         self,
         service_account_token: str | None = None,
         allowed_vaults: str | None = None,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
     ):
         """Initialize the 1Password client.
 
@@ -35,6 +74,8 @@ class OnePasswordClient:
                                   Falls back to OP_SERVICE_ACCOUNT_TOKEN env var.
             allowed_vaults: Comma-separated vault names to allow access to.
                            Falls back to OP_ALLOWED_VAULTS env var (default: "AI").
+            cache_ttl: Seconds to cache vault, item list and (redacted) item
+                      results. Secrets are never cached. 0 disables caching.
         """
         # SECURITY: Token is stored in memory for SDK authentication.
         # The service account token is scoped to specific vaults at creation time
@@ -46,40 +87,195 @@ class OnePasswordClient:
             )
 
         self._client: Client | None = None
+        self._pool_key = hashlib.sha256(self._token.encode()).hexdigest()
         self._vault_filter = VaultFilter(allowed_vaults)
         self._field_redactor = FieldRedactor()
 
         # Cache vault ID -> name mapping for allowlist checks
         self._vault_cache: dict[str, str] = {}
+        # Vault ID -> casefolded name, so allowlist checks skip str.casefold()
+        self._vault_cache_lower: dict[str, str] = {}
+        # IDs of cached vaults that pass the allowlist
+        self._allowed_vault_ids: set[str] = set()
+        # Monotonic time of the last full vault refresh, or None if the
+        # vaults have never been loaded
+        self._vault_refreshed_at: float | None = None
+
+        # SDK calls in progress, shared by concurrent identical requests
+        self._inflight: dict[tuple[str, ...], asyncio.Task] = {}
+
+        # Read-only results, keyed like _inflight
+        self._response_cache = TTLCache(maxsize=512, ttl=cache_ttl)
 
     async def _get_client(self) -> Client:
-        """Get or create the authenticated 1Password client."""
+        """Get or create the authenticated 1Password client.
+
+        Instances with the same token share one authenticated SDK client.
+        """
         if self._client is None:
+            async with _CLIENT_LOCKS[self._pool_key]:
+                client = _CLIENT_POOL.get(self._pool_key)
+                if client is None:
+                    try:
+                        client = await Client.authenticate(
+                            auth=self._token,
+                            integration_name="onepassword-mcp",
+                            integration_version="0.1.0",
+                        )
+                        logger.info("1Password client authenticated successfully")
+                    except Exception as e:
+                        raise OnePasswordClientError(f"Failed to authenticate: {e}") from e
+                    _CLIENT_POOL[self._pool_key] = client
+                self._client = client
+        return self._client
+
+    def close(self) -> None:
+        """Drop the SDK client so the next call authenticates again.
+
+        Also evicts it from the shared pool, e.g. after the token was
+        rotated or the session stopped working.
+        """
+        if _CLIENT_POOL.get(self._pool_key) is self._client:
+            del _CLIENT_POOL[self._pool_key]
+        self._client = None
+
+    async def aclose(self) -> None:
+        """Drop the SDK session, e.g. when the server shuts down.
+
+        Evicts it from the shared pool like close(). The SDK has no public
+        way to end a session early, so its native client is released when
+        the process exits; other OnePasswordClients that already hold it
+        can keep using it until then.
+        """
+        self.close()
+
+    async def _coalesce(
+        self,
+        key: tuple[str, ...],
+        factory: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Run factory() once for all concurrent callers with the same key.
+
+        Each caller awaits the shared task through asyncio.shield, so one
+        caller being cancelled doesn't cancel the call for the others.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+
+            def _done(finished: asyncio.Task) -> None:
+                if self._inflight.get(key) is finished:
+                    del self._inflight[key]
+                # Mark the exception retrieved even if every caller was cancelled
+                if not finished.cancelled():
+                    finished.exception()
+
+            task.add_done_callback(_done)
+        return await asyncio.shield(task)
+
+    async def _cached(
+        self,
+        key: tuple[str, ...],
+        factory: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Return the cached result for key, fetching it once on a miss."""
+        return await self._response_cache.get_or_set(key, factory)
+
+    def invalidate(self, vault_id: str | None = None, item_id: str | None = None) -> None:
+        """Drop cached results so the next read goes to 1Password.
+
+        Args:
+            vault_id: Vault whose cached item list and items to drop.
+                     If omitted, the whole cache is cleared.
+            item_id: Only drop this item (and the vault's item lists).
+        """
+        if vault_id is None:
+            self._response_cache.clear()
+            return
+
+        def matches(key: tuple[str, ...]) -> bool:
+            if key[0] == "list_items":
+                return key[1] == vault_id
+            if key[0] == "get_item":
+                return key[1] == vault_id and item_id in (None, key[2])
+            return False
+
+        self._response_cache.discard(matches)
+
+    async def refresh_vaults(self) -> None:
+        """Reload the vault ID -> name cache from 1Password.
+
+        Concurrent refreshes share one SDK call. Vaults that were renamed
+        out of the allowlist (or deleted) lose access once this completes.
+        """
+        await self._coalesce(("refresh_vaults",), self._refresh_vault_cache)
+
+    async def refresh_vaults_periodically(
+        self, interval: float = VAULT_REFRESH_INTERVAL
+    ) -> None:
+        """Refresh the vault cache every interval seconds until cancelled.
+
+        Bounds how long the allowlist can act on stale vault names without
+        making allowlist checks wait for the API.
+        """
+        while True:
+            await asyncio.sleep(interval)
             try:
-                self._client = await Client.authenticate(
-                    auth=self._token,
-                    integration_name="onepassword-mcp",
-                    integration_version="0.1.0",
-                )
-                logger.info("1Password client authenticated successfully")
+                await self.refresh_vaults()
             except Exception as e:
-                raise OnePasswordClientError(f"Failed to authenticate: {e}") from e
-        return self._client
+                logger.warning(f"Background vault refresh failed: {e}")
 
     async def _refresh_vault_cache(self) -> None:
         """Refresh the vault ID -> name cache."""
         client = await self._get_client()
+        vaults = [(vault.id, vault.name) async for vault in await client.vaults.list_all()]
+
+        # Swap in the complete list at once, so checks running during the
+        # refresh never see a partly filled cache
         self._vault_cache = {}
-        async for vault in await client.vaults.list_all():
-            self._vault_cache[vault.id] = vault.name
+        self._vault_cache_lower = {}
+        self._allowed_vault_ids = set()
+        for vault_id, name in vaults:
+            self._remember_vault(vault_id, name, name.casefold())
+        self._vault_refreshed_at = time.monotonic()
+
+    def _remember_vault(self, vault_id: str, name: str, name_lower: str) -> None:
+        """Add a vault to the ID -> name caches."""
+        self._vault_cache[vault_id] = name
+        self._vault_cache_lower[vault_id] = name_lower
+        if self._vault_filter.is_allowed_lower(name_lower):
+            self._allowed_vault_ids.add(vault_id)
 
     async def _is_vault_allowed(self, vault_id: str) -> bool:
-        """Check if a vault ID is in the allowlist."""
-        if vault_id not in self._vault_cache:
-            await self._refresh_vault_cache()
+        """Check if a vault ID is in the allowlist.
 
-        vault_name = self._vault_cache.get(vault_id, "")
-        return self._vault_filter.is_allowed(vault_name)
+        Unknown IDs load the vault list if it was never loaded, then
+        refresh it at most once every VAULT_REFRESH_INTERVAL seconds; in
+        between they are denied.
+        """
+        if vault_id in self._allowed_vault_ids:
+            return True
+
+        refreshed_at = self._vault_refreshed_at
+        if vault_id not in self._vault_cache and (
+            refreshed_at is None
+            or time.monotonic() - refreshed_at >= VAULT_REFRESH_INTERVAL
+        ):
+            await self.refresh_vaults()
+
+        vault_name_lower = self._vault_cache_lower.get(vault_id)
+        if vault_name_lower is None:
+            vault_name_lower = self._vault_cache.get(vault_id, "").casefold()
+        return self._vault_filter.is_allowed_lower(vault_name_lower)
+
+    async def _check_vault_allowed(self, vault_id: str) -> None:
+        """Raise if a vault ID is not in the allowlist."""
+        if not await self._is_vault_allowed(vault_id):
+            vault_name = self._vault_cache.get(vault_id, vault_id)
+            raise OnePasswordClientError(
+                f"Vault '{vault_name}' (ID: {vault_id}) is not in the allowed vaults list"
+            )
 
     async def list_vaults(self) -> list[dict[str, Any]]:
         """List all accessible vaults (filtered by allowlist).
@@ -87,23 +283,35 @@ class OnePasswordClient:
         Returns:
             List of vault dictionaries with id and name.
         """
+        return await self._cached(("list_vaults",), self._fetch_vaults)
+
+    async def _fetch_vaults(self) -> list[dict[str, Any]]:
+        """Fetch the allowed vaults from the SDK."""
+        return [vault async for vault in self.iter_vaults()]
+
+    async def iter_vaults(self) -> AsyncIterator[dict[str, Any]]:
+        """Yield accessible vaults (filtered by allowlist) as they are listed.
+
+        Unlike list_vaults, this always goes to 1Password and is not cached.
+
+        Yields:
+            Vault dictionaries with id and name.
+        """
         client = await self._get_client()
-        vaults = []
 
         try:
             async for vault in await client.vaults.list_all():
-                if self._vault_filter.is_allowed(vault.name):
-                    vaults.append({
+                name_lower = vault.name.casefold()
+                if self._vault_filter.is_allowed_lower(name_lower):
+                    # Update cache
+                    self._remember_vault(vault.id, vault.name, name_lower)
+                    yield {
                         "id": vault.id,
                         "name": vault.name,
-                    })
-                    # Update cache
-                    self._vault_cache[vault.id] = vault.name
+                    }
         except Exception as e:
             raise OnePasswordClientError(f"Failed to list vaults: {e}") from e
 
-        return vaults
-
     async def list_items(
         self,
         vault_id: str,
@@ -118,32 +326,66 @@ class OnePasswordClient:
         Returns:
             List of item dictionaries with id, title, and category.
         """
-        if not await self._is_vault_allowed(vault_id):
-            vault_name = self._vault_cache.get(vault_id, vault_id)
-            raise OnePasswordClientError(
-                f"Vault '{vault_name}' (ID: {vault_id}) is not in the allowed vaults list"
-            )
+        await self._check_vault_allowed(vault_id)
+
+        return await self._cached(
+            ("list_items", vault_id, category.upper() if category else ""),
+            lambda: self._fetch_items(vault_id, category),
+        )
+
+    async def _fetch_items(
+        self,
+        vault_id: str,
+        category: str | None,
+    ) -> list[dict[str, Any]]:
+        """Fetch a vault's items from the SDK."""
+        return [item async for item in self._iter_items(vault_id, category)]
+
+    async def iter_items(
+        self,
+        vault_id: str,
+        category: str | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield items in a vault (filtered by allowlist) as they are listed.
+
+        Unlike list_items, this always goes to 1Password and is not cached.
+
+        Args:
+            vault_id: The vault ID to list items from.
+            category: Optional category filter (e.g., "LOGIN", "PASSWORD").
 
+        Yields:
+            Item dictionaries with id, title, and category.
+        """
+        await self._check_vault_allowed(vault_id)
+
+        async for item in self._iter_items(vault_id, category):
+            yield item
+
+    async def _iter_items(
+        self,
+        vault_id: str,
+        category: str | None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield a vault's items from the SDK without an allowlist check."""
         client = await self._get_client()
-        items = []
+        wanted = category.upper() if category else None
 
         try:
             async for item in await client.items.list_all(vault_id):
                 # Apply category filter if specified
-                if category and item.category.name.upper() != category.upper():
+                if wanted and item.category.name.upper() != wanted:
                     continue
 
-                items.append({
+                yield {
                     "id": item.id,
                     "title": item.title,
                     "category": item.category.name,
                     "vault_id": vault_id,
-                })
+                }
         except Exception as e:
             raise OnePasswordClientError(f"Failed to list items: {e}") from e
 
-        return items
-
     async def get_item(
         self,
         vault_id: str,
@@ -151,6 +393,9 @@ class OnePasswordClient:
     ) -> dict[str, Any]:
         """Get item details (with sensitive fields redacted).
 
+        Results are cached for cache_ttl seconds, and concurrent calls for
+        the same item share a single SDK request.
+
         Args:
             vault_id: The vault ID containing the item.
             item_id: The item ID to retrieve.
@@ -158,12 +403,15 @@ class OnePasswordClient:
         Returns:
             Item dictionary with redacted sensitive fields.
         """
-        if not await self._is_vault_allowed(vault_id):
-            vault_name = self._vault_cache.get(vault_id, vault_id)
-            raise OnePasswordClientError(
-                f"Vault '{vault_name}' (ID: {vault_id}) is not in the allowed vaults list"
-            )
+        await self._check_vault_allowed(vault_id)
 
+        return await self._cached(
+            ("get_item", vault_id, item_id),
+            lambda: self._fetch_item(vault_id, item_id),
+        )
+
+    async def _fetch_item(self, vault_id: str, item_id: str) -> dict[str, Any]:
+        """Fetch an item from the SDK and convert it to a redacted dict."""
         client = await self._get_client()
 
         try:
@@ -209,6 +457,8 @@ class OnePasswordClient:
     async def resolve_secret(self, secret_reference: str) -> str:
         """Resolve a secret reference to its value.
 
+        Concurrent calls for the same reference share a single SDK request.
+
         Args:
             secret_reference: Secret reference in format "op://vault/item/field"
                              or "op://vault/item/section/field".
@@ -216,25 +466,30 @@ class OnePasswordClient:
         Returns:
             The secret value.
         """
-        # Validate reference format
-        if not secret_reference.startswith("op://"):
-            raise OnePasswordClientError(
-                "Secret reference must start with 'op://'"
-            )
-
-        # Extract vault from reference for allowlist check
-        parts = secret_reference[5:].split("/")
-        if len(parts) < 3:
+        # Validate reference format and extract vault for allowlist check
+        match = _SECRET_REFERENCE_RE.fullmatch(secret_reference)
+        if match is None:
+            if not secret_reference.startswith("op://"):
+                raise OnePasswordClientError(
+                    "Secret reference must start with 'op://'"
+                )
             raise OnePasswordClientError(
                 "Invalid secret reference format. Use: op://vault/item/field"
             )
 
-        vault_name = parts[0]
+        vault_name = match["vault"]
         if not self._vault_filter.is_allowed(vault_name):
             raise OnePasswordClientError(
                 f"Vault '{vault_name}' is not in the allowed vaults list"
             )
 
+        return await self._coalesce(
+            ("resolve_secret", secret_reference),
+            lambda: self._resolve(secret_reference),
+        )
+
+    async def _resolve(self, secret_reference: str) -> str:
+        """Resolve a validated secret reference with the SDK."""
         client = await self._get_client()
 
         try:
@@ -258,15 +513,11 @@ class OnePasswordClient:
         Returns:
             The current OTP code.
         """
-        if not await self._is_vault_allowed(vault_id):
-            vault_name = self._vault_cache.get(vault_id, vault_id)
-            raise OnePasswordClientError(
-                f"Vault '{vault_name}' (ID: {vault_id}) is not in the allowed vaults list"
-            )
+        await self._check_vault_allowed(vault_id)
 
         # Get vault name for reference - must have valid name, not ID
         if vault_id not in self._vault_cache:
-            await self._refresh_vault_cache()
+            await self.refresh_vaults()
 
         if vault_id not in self._vault_cache:
             raise OnePasswordClientError(
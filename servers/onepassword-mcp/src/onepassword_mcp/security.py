@@ -4,35 +4,44 @@ Handles vault allowlisting, field redaction, and rate limiting.
 """
 
 import asyncio
-import copy
 import logging
 import os
+import re
 import time
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
 # Sensitive field types that should be redacted in item listings
-SENSITIVE_FIELD_TYPES = {
+SENSITIVE_FIELD_TYPES = frozenset({
     "CONCEALED",
     "PASSWORD",
     "CREDIT_CARD_NUMBER",
     "CREDIT_CARD_VERIFICATION_NUMBER",
-}
+})
 
 # Fields to always redact by ID pattern
-SENSITIVE_FIELD_IDS = {
+SENSITIVE_FIELD_IDS = frozenset({
     "password",
     "credential",
     "secret",
     "cvv",
     "pin",
-}
+})
+
+# Matches a field ID containing any of SENSITIVE_FIELD_IDS in one scan,
+# in any case, so IDs needn't be lowercased first
+_SENSITIVE_ID_RE = re.compile(
+    "|".join(re.escape(s) for s in sorted(SENSITIVE_FIELD_IDS)),
+    re.IGNORECASE,
+)
 
 
 class VaultFilter:
     """Filters vault access based on allowlist."""
 
+    __slots__ = ("allowed_vaults",)
+
     def __init__(self, allowed_vaults: str | None = None):
         """Initialize with comma-separated vault names.
 
@@ -41,48 +50,64 @@ class VaultFilter:
                            Defaults to "AI" if not specified.
         """
         raw = allowed_vaults or os.environ.get("OP_ALLOWED_VAULTS", "AI")
-        self.allowed_vaults = {v.strip().lower() for v in raw.split(",") if v.strip()}
+        # Casefolded names, so matching is case-insensitive for any script
+        self.allowed_vaults = frozenset(
+            v.strip().casefold() for v in raw.split(",") if v.strip()
+        )
         logger.info(f"Vault allowlist: {self.allowed_vaults}")
 
     def is_allowed(self, vault_name: str) -> bool:
         """Check if a vault is in the allowlist."""
-        return vault_name.lower() in self.allowed_vaults
+        return vault_name.casefold() in self.allowed_vaults
+
+    def is_allowed_lower(self, vault_name_lower: str) -> bool:
+        """Check an already-casefolded vault name against the allowlist."""
+        return vault_name_lower in self.allowed_vaults
 
     def filter_vaults(self, vaults: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Filter a list of vaults to only those allowed."""
-        return [v for v in vaults if self.is_allowed(v.get("name", ""))]
+        allowed = self.allowed_vaults
+        return [v for v in vaults if v.get("name", "").casefold() in allowed]
 
 
 class FieldRedactor:
     """Redacts sensitive fields in item data."""
 
-    REDACTED = "[REDACTED]"
+    __slots__ = ()  # Stateless; REDACTED is a class constant
 
-    def redact_field(self, field: dict[str, Any]) -> dict[str, Any]:
-        """Redact a single field if it contains sensitive data."""
-        field_type = field.get("field_type", "").upper()
-        field_id = field.get("id", "").lower()
+    REDACTED = "[REDACTED]"
 
-        # Check if this field type or ID should be redacted
-        should_redact = (
-            field_type in SENSITIVE_FIELD_TYPES or
-            any(s in field_id for s in SENSITIVE_FIELD_IDS)
+    @staticmethod
+    def is_sensitive(field: dict[str, Any]) -> bool:
+        """Check if a field has a value that should be redacted."""
+        return "value" in field and (
+            field.get("field_type", "").upper() in SENSITIVE_FIELD_TYPES or
+            _SENSITIVE_ID_RE.search(field.get("id", "")) is not None
         )
 
-        if should_redact and "value" in field:
-            redacted = field.copy()
-            redacted["value"] = self.REDACTED
-            return redacted
+    def redact_field(self, field: dict[str, Any]) -> dict[str, Any]:
+        """Redact a single field if it contains sensitive data."""
+        if self.is_sensitive(field):
+            return {**field, "value": self.REDACTED}
 
         return field
 
     def redact_item(self, item: dict[str, Any]) -> dict[str, Any]:
-        """Redact all sensitive fields in an item."""
-        redacted = copy.deepcopy(item)
+        """Redact all sensitive fields in an item.
+
+        Returns a new item with a new fields list; unredacted fields and
+        other values (tags, urls) are shared with the input, which is
+        never modified.
+        """
+        redacted = dict(item)
 
         if "fields" in redacted:
+            # Same as calling redact_field per field, without the extra call
+            is_sensitive = self.is_sensitive
+            value = self.REDACTED
             redacted["fields"] = [
-                self.redact_field(f) for f in redacted["fields"]
+                {**f, "value": value} if is_sensitive(f) else f
+                for f in redacted["fields"]
             ]
 
         return redacted
@@ -93,30 +118,50 @@ class RateLimiter:
 
     Enforces a minimum delay between op_resolve_secret calls to prevent
     rapid-fire credential harvesting while keeping UX smooth.
+
+    Works as a token bucket holding `capacity` tokens, refilled one every
+    min_delay seconds. Rather than counting tokens it tracks when the
+    bucket will next be full: each caller reserves the next free slot and
+    sleeps until it arrives, so waiters are released in arrival order
+    without polling. There is no await between reading and advancing the
+    slot, so this is safe without a lock as long as all callers share one
+    event loop.
     """
 
-    def __init__(self, min_delay_seconds: float = 1.0):
+    __slots__ = ("min_delay", "capacity", "_full_at")
+
+    def __init__(self, min_delay_seconds: float = 1.0, capacity: int = 1):
         """Initialize rate limiter.
 
         Args:
             min_delay_seconds: Minimum seconds between resolve calls.
+            capacity: Calls allowed back to back before the delay applies.
         """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
         self.min_delay = min_delay_seconds
-        self._last_resolve_time: float = 0.0
-        self._lock = asyncio.Lock()
+        self.capacity = capacity
+        # Monotonic time at which the bucket will be full again, assuming
+        # every reserved slot is used
+        self._full_at: float = 0.0
 
     async def acquire(self) -> None:
         """Wait if needed to respect rate limit."""
-        async with self._lock:
-            now = time.monotonic()
-            elapsed = now - self._last_resolve_time
-
-            if elapsed < self.min_delay and self._last_resolve_time > 0:
-                wait_time = self.min_delay - elapsed
-                logger.debug(f"Rate limiting: waiting {wait_time:.2f}s")
+        now = time.monotonic()
+        full_at = max(now, self._full_at) + self.min_delay
+        self._full_at = full_at
+
+        wait_time = full_at - self.capacity * self.min_delay - now
+        if wait_time > 0:
+            logger.debug(f"Rate limiting: waiting {wait_time:.2f}s")
+            try:
                 await asyncio.sleep(wait_time)
-
-            self._last_resolve_time = time.monotonic()
+            except asyncio.CancelledError:
+                # Give the slot back if no one has queued behind it, so a
+                # cancelled call doesn't delay the next one
+                if self._full_at == full_at:
+                    self._full_at -= self.min_delay
+                raise
 
 
 def is_writes_enabled() -> bool:
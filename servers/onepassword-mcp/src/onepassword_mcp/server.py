@@ -13,17 +13,32 @@ Usage:
 """
 
 import asyncio
+import functools
 import json
 import logging
 import os
 import sys
-from typing import Any
+from typing import Any, Awaitable, Callable
 
+# orjson is optional; it serializes large item lists much faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# uvloop is optional (and unavailable on Windows); a faster event loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+import jsonschema
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
-from mcp.types import TextContent, Tool
+from mcp.types import CallToolResult, TextContent, Tool
 
-from .client import OnePasswordClient, OnePasswordClientError
+from .cache import TTLCache
+from .client import VAULT_REFRESH_INTERVAL, OnePasswordClient, OnePasswordClientError
 from .security import RateLimiter
 
 # Configure logging
@@ -37,49 +52,117 @@ logger = logging.getLogger(__name__)
 # Initialize the MCP server
 server = Server("onepassword-mcp")
 
-# Lazy-initialized client and rate limiter
-_op_client: OnePasswordClient | None = None
-_rate_limiter: RateLimiter | None = None
+# op_get_items limits: items per call, and SDK requests in flight at once
+MAX_BATCH_ITEMS = 50
+BATCH_CONCURRENCY = 10
+
+# Most secret values kept when OP_SECRET_CACHE_TTL enables the secret cache
+SECRET_CACHE_SIZE = 128
+
+# The client and rate limiter are created on first use and then reused for
+# the life of the process. functools.cache doesn't store exceptions, so a
+# missing token is reported again on each call until it is fixed.
 
 
+@functools.cache
 def get_client() -> OnePasswordClient:
     """Get or create the 1Password client."""
-    global _op_client
-    if _op_client is None:
-        _op_client = OnePasswordClient()
-    return _op_client
+    return OnePasswordClient()
 
 
+@functools.cache
 def get_rate_limiter() -> RateLimiter:
     """Get or create the rate limiter for secret resolution."""
-    global _rate_limiter
-    if _rate_limiter is None:
-        _rate_limiter = RateLimiter(min_delay_seconds=1.0)
-    return _rate_limiter
+    return RateLimiter(min_delay_seconds=1.0)
+
+
+@functools.cache
+def get_secret_cache() -> TTLCache:
+    """Get or create the cache of resolved secret values.
+
+    Off unless OP_SECRET_CACHE_TTL is set to a positive number of seconds.
+    """
+    return TTLCache(maxsize=SECRET_CACHE_SIZE, ttl=_secret_cache_ttl())
+
+
+def _secret_cache_ttl() -> float:
+    """Read OP_SECRET_CACHE_TTL, disabling the cache if it isn't a number."""
+    raw = os.environ.get("OP_SECRET_CACHE_TTL", "0")
+    try:
+        return float(raw)
+    except ValueError:
+        logger.warning(f"Ignoring invalid OP_SECRET_CACHE_TTL {raw!r}; secret cache disabled")
+        return 0.0
 
 
 def format_response(data: Any) -> str:
     """Format response data as readable JSON."""
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        ).decode()
     return json.dumps(data, indent=2, default=str)
 
 
+def text_response(text: str) -> list[TextContent]:
+    """Wrap text as a tool response."""
+    return [TextContent(type="text", text=text)]
+
+
+def json_response(data: Any) -> list[TextContent]:
+    """Format data as a JSON tool response."""
+    return text_response(format_response(data))
+
+
+# Responses for missing or invalid arguments, built once. MCP copies the
+# returned list into the result, so sharing these between calls is safe.
+_VAULT_ID_REQUIRED = text_response("Error: vault_id is required")
+_VAULT_AND_ITEM_REQUIRED = text_response("Error: vault_id and item_id are required")
+_VAULT_AND_ITEMS_REQUIRED = text_response("Error: vault_id and item_ids are required")
+_TOO_MANY_ITEMS = text_response(
+    f"Error: at most {MAX_BATCH_ITEMS} item_ids can be requested at once"
+)
+_SECRET_REFERENCE_REQUIRED = text_response("Error: secret_reference is required")
+
+
+def _client_error(error: Exception) -> list[TextContent]:
+    """Response for errors raised by the 1Password client wrapper."""
+    return [
+        TextContent(
+            type="text",
+            text=f"1Password error: {error}",
+        )
+    ]
+
+
+def _unexpected_error(error: Exception) -> list[TextContent]:
+    """Response for any other error."""
+    logger.error("Unexpected error: %s", error, exc_info=True)
+    return [
+        TextContent(
+            type="text",
+            text=f"Unexpected error: {error}",
+        )
+    ]
+
+
+# Exception type -> response builder; handle_error() uses the entry for the
+# most specific class in the error's MRO
+_ERROR_HANDLERS: dict[type, Callable[[Exception], list[TextContent]]] = {
+    OnePasswordClientError: _client_error,
+    Exception: _unexpected_error,
+}
+
+
 def handle_error(error: Exception) -> list[TextContent]:
     """Handle errors and return appropriate MCP response."""
-    if isinstance(error, OnePasswordClientError):
-        return [
-            TextContent(
-                type="text",
-                text=f"1Password error: {error}",
-            )
-        ]
-    else:
-        logger.error("Unexpected error: %s", error, exc_info=True)
-        return [
-            TextContent(
-                type="text",
-                text=f"Unexpected error: {error}",
-            )
-        ]
+    for cls in type(error).__mro__:
+        handler = _ERROR_HANDLERS.get(cls)
+        if handler is not None:
+            return handler(error)
+    return _unexpected_error(error)
 
 
 # =============================================================================
@@ -87,99 +170,132 @@ def handle_error(error: Exception) -> list[TextContent]:
 # =============================================================================
 
 
-@server.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available 1Password tools."""
-    tools = [
-        Tool(
-            name="op_list_vaults",
-            description="List all accessible 1Password vaults (filtered by allowlist)",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": [],
+# Tools advertised by list_tools(), built once at import; they never change.
+# Note: Write tools (op_create_item, op_archive_item, op_generate_password)
+# are not exposed until fully implemented. The handlers exist as stubs
+# but are not advertised in the tool list. When implementing, append them
+# here once at startup if is_writes_enabled().
+_TOOLS: tuple[Tool, ...] = (
+    Tool(
+        name="op_list_vaults",
+        description="List all accessible 1Password vaults (filtered by allowlist)",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": [],
+        },
+    ),
+    Tool(
+        name="op_list_items",
+        description="List items in a 1Password vault",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "vault_id": {
+                    "type": "string",
+                    "description": "The vault ID to list items from",
+                },
+                "category": {
+                    "type": "string",
+                    "description": "Optional category filter (e.g., LOGIN, PASSWORD, API_CREDENTIAL)",
+                },
             },
-        ),
-        Tool(
-            name="op_list_items",
-            description="List items in a 1Password vault",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "vault_id": {
-                        "type": "string",
-                        "description": "The vault ID to list items from",
-                    },
-                    "category": {
-                        "type": "string",
-                        "description": "Optional category filter (e.g., LOGIN, PASSWORD, API_CREDENTIAL)",
-                    },
+            "required": ["vault_id"],
+        },
+    ),
+    Tool(
+        name="op_get_item",
+        description="Get item details from 1Password (sensitive fields redacted)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "vault_id": {
+                    "type": "string",
+                    "description": "The vault ID containing the item",
+                },
+                "item_id": {
+                    "type": "string",
+                    "description": "The item ID to retrieve",
                 },
-                "required": ["vault_id"],
             },
+            "required": ["vault_id", "item_id"],
+        },
+    ),
+    Tool(
+        name="op_get_items",
+        description=(
+            "Get details for several items in one vault at once (sensitive fields redacted). "
+            f"Up to {MAX_BATCH_ITEMS} items; each result has its own status."
         ),
-        Tool(
-            name="op_get_item",
-            description="Get item details from 1Password (sensitive fields redacted)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "vault_id": {
-                        "type": "string",
-                        "description": "The vault ID containing the item",
-                    },
-                    "item_id": {
-                        "type": "string",
-                        "description": "The item ID to retrieve",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "vault_id": {
+                    "type": "string",
+                    "description": "The vault ID containing the items",
+                },
+                "item_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "maxItems": MAX_BATCH_ITEMS,
+                    "description": "The item IDs to retrieve",
                 },
-                "required": ["vault_id", "item_id"],
             },
-        ),
-        Tool(
-            name="op_resolve_secret",
-            description="Resolve a secret reference to get its value. Use format: op://vault/item/field",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "secret_reference": {
-                        "type": "string",
-                        "description": "Secret reference (e.g., op://AI/GitHub/password)",
-                    },
+            "required": ["vault_id", "item_ids"],
+        },
+    ),
+    Tool(
+        name="op_resolve_secret",
+        description="Resolve a secret reference to get its value. Use format: op://vault/item/field",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "secret_reference": {
+                    "type": "string",
+                    "description": "Secret reference (e.g., op://AI/GitHub/password)",
                 },
-                "required": ["secret_reference"],
             },
-        ),
-        Tool(
-            name="op_get_otp",
-            description="Get the current TOTP code for an item",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "vault_id": {
-                        "type": "string",
-                        "description": "The vault ID containing the item",
-                    },
-                    "item_id": {
-                        "type": "string",
-                        "description": "The item ID with TOTP field",
-                    },
-                    "field_id": {
-                        "type": "string",
-                        "description": "Optional field ID if item has multiple TOTP fields",
-                    },
+            "required": ["secret_reference"],
+        },
+    ),
+    Tool(
+        name="op_get_otp",
+        description="Get the current TOTP code for an item",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "vault_id": {
+                    "type": "string",
+                    "description": "The vault ID containing the item",
+                },
+                "item_id": {
+                    "type": "string",
+                    "description": "The item ID with TOTP field",
+                },
+                "field_id": {
+                    "type": "string",
+                    "description": "Optional field ID if item has multiple TOTP fields",
                 },
-                "required": ["vault_id", "item_id"],
             },
-        ),
-    ]
+            "required": ["vault_id", "item_id"],
+        },
+    ),
+)
+
 
-    # Note: Write tools (op_create_item, op_archive_item, op_generate_password)
-    # are not exposed until fully implemented. The handlers exist as stubs
-    # but are not advertised in the tool list. When implementing, add them
-    # here conditionally on is_writes_enabled().
+# Tool name -> argument validator, compiled once. The MCP server would
+# otherwise check and compile each tool's schema again on every call.
+_VALIDATORS: dict[str, jsonschema.protocols.Validator] = {
+    tool.name: jsonschema.validators.validator_for(tool.inputSchema)(tool.inputSchema)
+    for tool in _TOOLS
+}
 
-    return tools
+
+@server.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available 1Password tools."""
+    # Hand out a fresh list so callers can't mutate the shared tuple
+    return list(_TOOLS)
 
 
 # =============================================================================
@@ -187,55 +303,47 @@ async def list_tools() -> list[Tool]:
 # =============================================================================
 
 
-@server.call_tool()
-async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
+@server.call_tool(validate_input=False)
+async def call_tool(
+    name: str, arguments: dict[str, Any]
+) -> list[TextContent] | CallToolResult:
     """Handle tool calls."""
     logger.info(f"Tool call: {name}")
 
+    validator = _VALIDATORS.get(name)
+    if validator is not None:
+        error = jsonschema.exceptions.best_match(validator.iter_errors(arguments))
+        if error is not None:
+            # Same result the MCP server returns when it validates input
+            return CallToolResult(
+                content=text_response(f"Input validation error: {error.message}"),
+                isError=True,
+            )
+
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return [
+            TextContent(
+                type="text",
+                text=f"Unknown tool: {name}",
+            )
+        ]
+
     try:
-        if name == "op_list_vaults":
-            return await handle_list_vaults()
-        elif name == "op_list_items":
-            return await handle_list_items(arguments)
-        elif name == "op_get_item":
-            return await handle_get_item(arguments)
-        elif name == "op_resolve_secret":
-            return await handle_resolve_secret(arguments)
-        elif name == "op_get_otp":
-            return await handle_get_otp(arguments)
-        # Write tools are not exposed in list_tools() until implemented.
-        # When implementing, uncomment these handlers:
-        # elif name == "op_create_item" and is_writes_enabled():
-        #     return await handle_create_item(arguments)
-        # elif name == "op_archive_item" and is_writes_enabled():
-        #     return await handle_archive_item(arguments)
-        # elif name == "op_generate_password" and is_writes_enabled():
-        #     return await handle_generate_password(arguments)
-        else:
-            return [
-                TextContent(
-                    type="text",
-                    text=f"Unknown tool: {name}",
-                )
-            ]
+        return await handler(arguments)
     except Exception as e:
         return handle_error(e)
 
 
-async def handle_list_vaults() -> list[TextContent]:
+async def handle_list_vaults(arguments: dict[str, Any]) -> list[TextContent]:
     """Handle op_list_vaults tool."""
     client = get_client()
     vaults = await client.list_vaults()
 
-    return [
-        TextContent(
-            type="text",
-            text=format_response({
-                "vaults": vaults,
-                "count": len(vaults),
-            }),
-        )
-    ]
+    return json_response({
+        "vaults": vaults,
+        "count": len(vaults),
+    })
 
 
 async def handle_list_items(arguments: dict[str, Any]) -> list[TextContent]:
@@ -244,21 +352,16 @@ async def handle_list_items(arguments: dict[str, Any]) -> list[TextContent]:
     category = arguments.get("category")
 
     if not vault_id:
-        return [TextContent(type="text", text="Error: vault_id is required")]
+        return _VAULT_ID_REQUIRED
 
     client = get_client()
     items = await client.list_items(vault_id, category)
 
-    return [
-        TextContent(
-            type="text",
-            text=format_response({
-                "items": items,
-                "count": len(items),
-                "vault_id": vault_id,
-            }),
-        )
-    ]
+    return json_response({
+        "items": items,
+        "count": len(items),
+        "vault_id": vault_id,
+    })
 
 
 async def handle_get_item(arguments: dict[str, Any]) -> list[TextContent]:
@@ -267,17 +370,46 @@ async def handle_get_item(arguments: dict[str, Any]) -> list[TextContent]:
     item_id = arguments.get("item_id")
 
     if not vault_id or not item_id:
-        return [TextContent(type="text", text="Error: vault_id and item_id are required")]
+        return _VAULT_AND_ITEM_REQUIRED
 
     client = get_client()
     item = await client.get_item(vault_id, item_id)
 
-    return [
-        TextContent(
-            type="text",
-            text=format_response(item),
-        )
-    ]
+    return json_response(item)
+
+
+async def handle_get_items(arguments: dict[str, Any]) -> list[TextContent]:
+    """Handle op_get_items tool."""
+    vault_id = arguments.get("vault_id")
+    item_ids = arguments.get("item_ids")
+
+    if not vault_id or not item_ids or not isinstance(item_ids, list):
+        return _VAULT_AND_ITEMS_REQUIRED
+    if len(item_ids) > MAX_BATCH_ITEMS:
+        return _TOO_MANY_ITEMS
+
+    client = get_client()
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def fetch(item_id: str) -> dict[str, Any]:
+        # One failed item is reported in its slot rather than failing the batch
+        try:
+            async with semaphore:
+                item = await client.get_item(vault_id, item_id)
+            return {"id": item_id, "status": "ok", "item": item}
+        except OnePasswordClientError as e:
+            return {"id": item_id, "status": "error", "error": str(e)}
+        except Exception as e:
+            logger.error("Unexpected error getting item: %s", e, exc_info=True)
+            return {"id": item_id, "status": "error", "error": f"Unexpected error: {e}"}
+
+    results = await asyncio.gather(*(fetch(item_id) for item_id in item_ids))
+
+    return json_response({
+        "items": results,
+        "count": len(results),
+        "vault_id": vault_id,
+    })
 
 
 async def handle_resolve_secret(arguments: dict[str, Any]) -> list[TextContent]:
@@ -285,7 +417,13 @@ async def handle_resolve_secret(arguments: dict[str, Any]) -> list[TextContent]:
     secret_reference = arguments.get("secret_reference")
 
     if not secret_reference:
-        return [TextContent(type="text", text="Error: secret_reference is required")]
+        return _SECRET_REFERENCE_REQUIRED
+
+    # A recently resolved secret skips both the rate limit and the SDK call
+    secret_cache = get_secret_cache()
+    secret = secret_cache.get(secret_reference)
+    if secret is not None:
+        return text_response(secret)
 
     # Apply rate limiting
     rate_limiter = get_rate_limiter()
@@ -293,13 +431,9 @@ async def handle_resolve_secret(arguments: dict[str, Any]) -> list[TextContent]:
 
     client = get_client()
     secret = await client.resolve_secret(secret_reference)
+    secret_cache.set(secret_reference, secret)
 
-    return [
-        TextContent(
-            type="text",
-            text=secret,
-        )
-    ]
+    return text_response(secret)
 
 
 async def handle_get_otp(arguments: dict[str, Any]) -> list[TextContent]:
@@ -309,17 +443,12 @@ async def handle_get_otp(arguments: dict[str, Any]) -> list[TextContent]:
     field_id = arguments.get("field_id")
 
     if not vault_id or not item_id:
-        return [TextContent(type="text", text="Error: vault_id and item_id are required")]
+        return _VAULT_AND_ITEM_REQUIRED
 
     client = get_client()
     otp = await client.get_otp(vault_id, item_id, field_id)
 
-    return [
-        TextContent(
-            type="text",
-            text=otp,
-        )
-    ]
+    return text_response(otp)
 
 
 async def handle_create_item(arguments: dict[str, Any]) -> list[TextContent]:
@@ -355,26 +484,60 @@ async def handle_generate_password(arguments: dict[str, Any]) -> list[TextConten
     ]
 
 
+# Tool name -> handler. Write tools are not exposed in list_tools() until
+# implemented. When implementing, add them here when is_writes_enabled():
+#     "op_create_item": handle_create_item,
+#     "op_archive_item": handle_archive_item,
+#     "op_generate_password": handle_generate_password,
+_HANDLERS: dict[str, Callable[[dict[str, Any]], Awaitable[list[TextContent]]]] = {
+    "op_list_vaults": handle_list_vaults,
+    "op_list_items": handle_list_items,
+    "op_get_item": handle_get_item,
+    "op_get_items": handle_get_items,
+    "op_resolve_secret": handle_resolve_secret,
+    "op_get_otp": handle_get_otp,
+}
+
+
 # =============================================================================
 # Main Entry Point
 # =============================================================================
 
 
+async def refresh_vaults_in_background() -> None:
+    """Keep the client's vault cache fresh while the server runs."""
+    # The client is created by the first tool call; until then (or if the
+    # token is missing) there is nothing to refresh
+    while not get_client.cache_info().currsize:
+        await asyncio.sleep(VAULT_REFRESH_INTERVAL)
+    await get_client().refresh_vaults_periodically(VAULT_REFRESH_INTERVAL)
+
+
 async def run_server() -> None:
     """Run the MCP server."""
     logger.info("Starting 1Password MCP Server...")
 
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options(),
-        )
+    refresher = asyncio.create_task(refresh_vaults_in_background())
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                server.create_initialization_options(),
+            )
+    finally:
+        refresher.cancel()
+        # Only close a client that was actually created
+        if get_client.cache_info().currsize:
+            await get_client().aclose()
 
 
 def main() -> None:
     """Main entry point."""
-    asyncio.run(run_server())
+    if uvloop is not None:
+        uvloop.run(run_server())
+    else:
+        asyncio.run(run_server())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,137 @@
+"""Tests for the response cache."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from onepassword_mcp.cache import TTLCache
+
+
+class TestTTLCache:
+    """Tests for TTLCache."""
+
+    def test_get_returns_stored_value(self):
+        """Stored values are returned until they expire."""
+        cache = TTLCache(ttl=60)
+        cache.set("key", "value")
+        assert cache.get("key") == "value"
+
+    def test_missing_key_returns_default(self):
+        """get() returns the default for unknown keys."""
+        cache = TTLCache()
+        assert cache.get("missing") is None
+        assert cache.get("missing", "default") == "default"
+
+    def test_entries_expire(self):
+        """Entries are dropped once their TTL has passed."""
+        cache = TTLCache(ttl=10)
+        with patch("onepassword_mcp.cache.time.monotonic", return_value=100.0):
+            cache.set("key", "value")
+        with patch("onepassword_mcp.cache.time.monotonic", return_value=109.0):
+            assert cache.get("key") == "value"
+        with patch("onepassword_mcp.cache.time.monotonic", return_value=110.0):
+            assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        """The least recently used entry is evicted when full."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_zero_ttl_disables_cache(self):
+        """A TTL of 0 stores nothing."""
+        cache = TTLCache(ttl=0)
+        cache.set("key", "value")
+        assert cache.get("key") is None
+
+    def test_discard_by_predicate(self):
+        """discard() removes only matching keys."""
+        cache = TTLCache(ttl=60)
+        cache.set(("list_items", "v1"), [])
+        cache.set(("list_items", "v2"), [])
+        cache.discard(lambda key: key[1] == "v1")
+
+        assert cache.get(("list_items", "v1")) is None
+        assert cache.get(("list_items", "v2")) == []
+
+    @pytest.mark.asyncio
+    async def test_get_or_set_fetches_once_for_concurrent_misses(self):
+        """Concurrent misses for one key share a single fetch."""
+        cache = TTLCache(ttl=60)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(cache.get_or_set("key", fetch) for _ in range(5)))
+
+        assert results == ["value"] * 5
+        assert calls == 1
+        assert cache._locks == {}
+
+    @pytest.mark.asyncio
+    async def test_get_or_set_does_not_cache_errors(self):
+        """A failed fetch is retried by the next call."""
+        cache = TTLCache(ttl=60)
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        async def succeed():
+            return "value"
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_set("key", fail)
+        assert await cache.get_or_set("key", succeed) == "value"
+
+    @pytest.mark.asyncio
+    async def test_get_or_set_late_arrival_waits_for_queued_callers(self):
+        """A caller arriving while others are queued joins the queue."""
+        cache = TTLCache(ttl=60)
+        running = 0
+        max_running = 0
+        late: list[asyncio.Task] = []
+
+        async def fetch():
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            try:
+                await asyncio.sleep(0.01)
+                if not late:
+                    # Arrives just as the first holder releases the lock,
+                    # while the other callers are still waiting for it
+                    asyncio.get_running_loop().call_soon(
+                        lambda: late.append(asyncio.ensure_future(cache.get_or_set("key", fetch)))
+                    )
+                raise RuntimeError("not cached")
+            finally:
+                running -= 1
+
+        calls = [cache.get_or_set("key", fetch) for _ in range(3)]
+        await asyncio.gather(*calls, return_exceptions=True)
+        await asyncio.gather(*late, return_exceptions=True)
+
+        assert late
+        assert max_running == 1
+        assert not cache._locks
+        assert not cache._lock_users
+
+    def test_set_with_custom_ttl(self):
+        """A per-entry TTL overrides the cache default."""
+        cache = TTLCache(ttl=60)
+        with patch("onepassword_mcp.cache.time.monotonic", return_value=100.0):
+            cache.set("key", "value", ttl=300)
+        with patch("onepassword_mcp.cache.time.monotonic", return_value=200.0):
+            assert cache.get("key") == "value"
@@ -1,7 +1,9 @@
 """Tests for 1Password client wrapper."""
 
+import asyncio
+
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from onepassword_mcp.client import OnePasswordClient, OnePasswordClientError
 
@@ -125,3 +127,407 @@ class TestSecretReferenceValidation:
             await client.resolve_secret("op://vault/item")
 
         assert "Invalid secret reference format" in str(exc_info.value)
+
+    @pytest.mark.asyncio
+    async def test_rejects_empty_parts(self, client):
+        """Vault, item and field must all be non-empty."""
+        for reference in ("op:///item/field", "op://AI//field", "op://AI/item/"):
+            with pytest.raises(OnePasswordClientError) as exc_info:
+                await client.resolve_secret(reference)
+
+            assert "Invalid secret reference format" in str(exc_info.value)
+
+
+class TestInflightDeduplication:
+    """Tests for sharing concurrent identical SDK calls."""
+
+    @pytest.fixture
+    def client(self):
+        """Create client with test token."""
+        return OnePasswordClient(
+            service_account_token="test_token",
+            allowed_vaults="AI",
+        )
+
+    @pytest.mark.asyncio
+    async def test_concurrent_resolves_share_one_call(self, client):
+        """Concurrent resolve_secret calls for one reference hit the SDK once."""
+        async def slow_resolve(reference):
+            await asyncio.sleep(0.05)
+            return "secret_value"
+
+        mock_sdk = AsyncMock()
+        mock_sdk.secrets.resolve = AsyncMock(side_effect=slow_resolve)
+        client._client = mock_sdk
+
+        results = await asyncio.gather(
+            *(client.resolve_secret("op://AI/item/password") for _ in range(5))
+        )
+
+        assert results == ["secret_value"] * 5
+        assert mock_sdk.secrets.resolve.await_count == 1
+        assert client._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_different_references_are_not_shared(self, client):
+        """Different references each get their own SDK call."""
+        mock_sdk = AsyncMock()
+        mock_sdk.secrets.resolve = AsyncMock(side_effect=lambda ref: ref)
+        client._client = mock_sdk
+
+        results = await asyncio.gather(
+            client.resolve_secret("op://AI/one/password"),
+            client.resolve_secret("op://AI/two/password"),
+        )
+
+        assert results == ["op://AI/one/password", "op://AI/two/password"]
+        assert mock_sdk.secrets.resolve.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_are_shared_then_retried(self, client):
+        """A failed call fails every waiter, and the next call retries."""
+        mock_sdk = AsyncMock()
+        mock_sdk.secrets.resolve = AsyncMock(side_effect=RuntimeError("boom"))
+        client._client = mock_sdk
+
+        results = await asyncio.gather(
+            client.resolve_secret("op://AI/item/password"),
+            client.resolve_secret("op://AI/item/password"),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, OnePasswordClientError) for r in results)
+        assert mock_sdk.secrets.resolve.await_count == 1
+
+        mock_sdk.secrets.resolve = AsyncMock(return_value="secret_value")
+        assert await client.resolve_secret("op://AI/item/password") == "secret_value"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_get_item_shares_one_call(self, client):
+        """Concurrent get_item calls for one item hit the SDK once."""
+        item = MagicMock()
+        item.id = "item_1"
+        item.title = "GitHub"
+        item.category.name = "LOGIN"
+        item.tags = []
+        item.fields = []
+        item.urls = []
+
+        mock_sdk = AsyncMock()
+        mock_sdk.items.get = AsyncMock(return_value=item)
+        client._client = mock_sdk
+        client._vault_cache = {"vault_ai": "AI"}
+
+        results = await asyncio.gather(
+            *(client.get_item("vault_ai", "item_1") for _ in range(3))
+        )
+
+        assert [r["title"] for r in results] == ["GitHub"] * 3
+        assert mock_sdk.items.get.await_count == 1
+
+
+class TestResponseCache:
+    """Tests for caching read-only results."""
+
+    @pytest.fixture
+    def item(self):
+        """Create a minimal SDK item."""
+        item = MagicMock()
+        item.id = "item_1"
+        item.title = "GitHub"
+        item.category.name = "LOGIN"
+        item.tags = []
+        item.fields = []
+        item.urls = []
+        return item
+
+    def make_client(self, item, cache_ttl=60.0):
+        """Create a client whose SDK returns item."""
+        client = OnePasswordClient(
+            service_account_token="test_token",
+            allowed_vaults="AI",
+            cache_ttl=cache_ttl,
+        )
+        mock_sdk = AsyncMock()
+        mock_sdk.items.get = AsyncMock(return_value=item)
+        client._client = mock_sdk
+        client._vault_cache = {"vault_ai": "AI"}
+        return client
+
+    @pytest.mark.asyncio
+    async def test_repeated_get_item_is_cached(self, item):
+        """A second get_item within the TTL doesn't call the SDK."""
+        client = self.make_client(item)
+
+        first = await client.get_item("vault_ai", "item_1")
+        second = await client.get_item("vault_ai", "item_1")
+
+        assert first == second
+        assert client._client.items.get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_allowlist_checked_on_cache_hit(self, item):
+        """Cached items are still subject to the vault allowlist."""
+        client = self.make_client(item)
+        await client.get_item("vault_ai", "item_1")
+
+        client._vault_cache = {"vault_ai": "Personal"}
+        with pytest.raises(OnePasswordClientError) as exc_info:
+            await client.get_item("vault_ai", "item_1")
+
+        assert "not in the allowed vaults list" in str(exc_info.value)
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_refetch(self, item):
+        """invalidate() drops cached items for the vault."""
+        client = self.make_client(item)
+
+        await client.get_item("vault_ai", "item_1")
+        client.invalidate("vault_ai", "item_1")
+        await client.get_item("vault_ai", "item_1")
+
+        assert client._client.items.get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_zero_ttl_disables_cache(self, item):
+        """cache_ttl=0 sends every call to the SDK."""
+        client = self.make_client(item, cache_ttl=0)
+
+        await client.get_item("vault_ai", "item_1")
+        await client.get_item("vault_ai", "item_1")
+
+        assert client._client.items.get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_resolve_secret_is_not_cached(self, item):
+        """Secret values are always fetched from the SDK."""
+        client = self.make_client(item)
+        client._client.secrets.resolve = AsyncMock(return_value="secret_value")
+
+        await client.resolve_secret("op://AI/item/password")
+        await client.resolve_secret("op://AI/item/password")
+
+        assert client._client.secrets.resolve.await_count == 2
+
+
+class TestIterators:
+    """Tests for streaming vault and item listings."""
+
+    @staticmethod
+    def sdk_object(**attrs):
+        """Create an SDK-like object with the given attributes."""
+        obj = MagicMock()
+        for name, value in attrs.items():
+            setattr(obj, name, value)
+        return obj
+
+    @staticmethod
+    def async_iter(values):
+        """Wrap values in an async iterator, as the SDK list_all() returns."""
+        async def gen():
+            for value in values:
+                yield value
+        return gen()
+
+    @pytest.mark.asyncio
+    async def test_iter_vaults_filters_by_allowlist(self):
+        """iter_vaults yields only allowed vaults."""
+        client = OnePasswordClient(service_account_token="test_token", allowed_vaults="AI")
+        vaults = [
+            self.sdk_object(id="v1", name="AI"),
+            self.sdk_object(id="v2", name="Personal"),
+        ]
+        mock_sdk = AsyncMock()
+        mock_sdk.vaults.list_all = AsyncMock(return_value=self.async_iter(vaults))
+        client._client = mock_sdk
+
+        result = [vault async for vault in client.iter_vaults()]
+
+        assert result == [{"id": "v1", "name": "AI"}]
+        assert client._vault_cache == {"v1": "AI"}
+
+    @pytest.mark.asyncio
+    async def test_list_vaults_makes_one_sdk_call(self):
+        """list_vaults filters the single vault listing, with no per-vault lookups."""
+        client = OnePasswordClient(service_account_token="test_token", allowed_vaults="AI,Dev")
+        vaults = [
+            self.sdk_object(id="v1", name="AI"),
+            self.sdk_object(id="v2", name="Personal"),
+            self.sdk_object(id="v3", name="Dev"),
+        ]
+        mock_sdk = AsyncMock()
+        mock_sdk.vaults.list_all = AsyncMock(return_value=self.async_iter(vaults))
+        client._client = mock_sdk
+
+        result = await client.list_vaults()
+
+        assert [vault["name"] for vault in result] == ["AI", "Dev"]
+        assert mock_sdk.vaults.list_all.await_count == 1
+        assert mock_sdk.vaults.get.await_count == 0
+
+    @pytest.mark.asyncio
+    async def test_iter_items_filters_by_category(self):
+        """iter_items applies the category filter while streaming."""
+        client = OnePasswordClient(service_account_token="test_token", allowed_vaults="AI")
+        client._vault_cache = {"v1": "AI"}
+        items = [
+            self.sdk_object(id="i1", title="GitHub", category=self.sdk_object(name="LOGIN")),
+            self.sdk_object(id="i2", title="Note", category=self.sdk_object(name="SECURE_NOTE")),
+        ]
+        mock_sdk = AsyncMock()
+        mock_sdk.items.list_all = AsyncMock(return_value=self.async_iter(items))
+        client._client = mock_sdk
+
+        result = [item async for item in client.iter_items("v1", category="login")]
+
+        assert [item["id"] for item in result] == ["i1"]
+
+    @pytest.mark.asyncio
+    async def test_iter_items_blocks_disallowed_vault(self):
+        """iter_items raises before listing a non-allowed vault."""
+        client = OnePasswordClient(service_account_token="test_token", allowed_vaults="AI")
+        client._vault_cache = {"v2": "Personal"}
+
+        with pytest.raises(OnePasswordClientError) as exc_info:
+            async for _ in client.iter_items("v2"):
+                pass
+
+        assert "not in the allowed vaults list" in str(exc_info.value)
+
+
+class TestVaultIdAllowlist:
+    """Tests for the precomputed allowed vault ID set."""
+
+    @pytest.fixture
+    def client(self):
+        """Create a client whose SDK lists one allowed and one other vault."""
+        client = OnePasswordClient(service_account_token="test_token", allowed_vaults="AI")
+        vaults = [
+            TestIterators.sdk_object(id="v1", name="AI"),
+            TestIterators.sdk_object(id="v2", name="Personal"),
+        ]
+        mock_sdk = AsyncMock()
+        mock_sdk.vaults.list_all = AsyncMock(
+            side_effect=lambda: TestIterators.async_iter(vaults)
+        )
+        client._client = mock_sdk
+        return client
+
+    @pytest.mark.asyncio
+    async def test_refresh_builds_allowed_ids(self, client):
+        """A refresh records only allowed vault IDs."""
+        assert await client._is_vault_allowed("v1")
+        assert client._allowed_vault_ids == {"v1"}
+        assert not await client._is_vault_allowed("v2")
+
+    @pytest.mark.asyncio
+    async def test_unknown_ids_refresh_once_per_interval(self, client):
+        """Unknown vault IDs don't trigger a refresh on every call."""
+        assert await client._is_vault_allowed("v1")
+        assert not await client._is_vault_allowed("missing")
+        assert not await client._is_vault_allowed("missing")
+
+        assert client._client.vaults.list_all.await_count == 1
+
+        client._vault_refreshed_at -= 301
+        assert not await client._is_vault_allowed("missing")
+        assert client._client.vaults.list_all.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_first_check_refreshes_soon_after_boot(self, client):
+        """The first lookup loads vaults even if the monotonic clock is small."""
+        with patch("onepassword_mcp.client.time.monotonic", return_value=5.0):
+            assert await client._is_vault_allowed("v1")
+
+        assert client._client.vaults.list_all.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_periodic_refresh_drops_renamed_vault(self, client):
+        """The background refresh revokes a vault renamed out of the allowlist."""
+        assert await client._is_vault_allowed("v1")
+
+        renamed = [TestIterators.sdk_object(id="v1", name="Archive")]
+        client._client.vaults.list_all = AsyncMock(
+            side_effect=lambda: TestIterators.async_iter(renamed)
+        )
+        task = asyncio.create_task(client.refresh_vaults_periodically(0.01))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+        assert not await client._is_vault_allowed("v1")
+        assert client._vault_cache == {"v1": "Archive"}
+
+
+class TestClientPool:
+    """Tests for sharing authenticated SDK clients."""
+
+    @pytest.fixture(autouse=True)
+    def empty_pool(self):
+        """Start and end each test with an empty client pool."""
+        from onepassword_mcp import client as client_module
+
+        client_module._CLIENT_POOL.clear()
+        yield
+        client_module._CLIENT_POOL.clear()
+
+    @pytest.mark.asyncio
+    async def test_same_token_authenticates_once(self):
+        """Instances with the same token share one SDK client."""
+        sdk = object()
+        with patch(
+            "onepassword_mcp.client.Client.authenticate",
+            new=AsyncMock(return_value=sdk),
+        ) as authenticate:
+            first = OnePasswordClient(service_account_token="test_token")
+            second = OnePasswordClient(service_account_token="test_token")
+
+            assert await first._get_client() is sdk
+            assert await second._get_client() is sdk
+            assert authenticate.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_different_tokens_authenticate_separately(self):
+        """Each token gets its own SDK client."""
+        with patch(
+            "onepassword_mcp.client.Client.authenticate",
+            new=AsyncMock(side_effect=lambda **kwargs: object()),
+        ) as authenticate:
+            first = OnePasswordClient(service_account_token="token_a")
+            second = OnePasswordClient(service_account_token="token_b")
+
+            assert await first._get_client() is not await second._get_client()
+            assert authenticate.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_close_evicts_pooled_client(self):
+        """close() makes the next call authenticate again."""
+        with patch(
+            "onepassword_mcp.client.Client.authenticate",
+            new=AsyncMock(side_effect=lambda **kwargs: object()),
+        ) as authenticate:
+            client = OnePasswordClient(service_account_token="test_token")
+            await client._get_client()
+            client.close()
+            await OnePasswordClient(service_account_token="test_token")._get_client()
+
+            assert authenticate.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_aclose_evicts_pooled_client(self):
+        """aclose() removes the pool entry without touching the SDK client."""
+        from onepassword_mcp import client as client_module
+
+        sdk = MagicMock()
+        with patch(
+            "onepassword_mcp.client.Client.authenticate",
+            new=AsyncMock(return_value=sdk),
+        ):
+            client = OnePasswordClient(service_account_token="test_token")
+            other = OnePasswordClient(service_account_token="test_token")
+            await client._get_client()
+            await other._get_client()
+            await client.aclose()
+
+        assert client._client is None
+        assert client._pool_key not in client_module._CLIENT_POOL
+        assert other._client is sdk
+        assert sdk.mock_calls == []
@@ -35,6 +35,19 @@ class TestVaultFilter:
         assert filter.is_allowed("PRODUCTION")
         assert not filter.is_allowed("AI")
 
+    def test_matches_casefolded_names(self):
+        """Matching uses casefold, not just lower."""
+        filter = VaultFilter("Straße")
+        assert filter.is_allowed("STRASSE")
+        assert filter.is_allowed("strasse")
+
+    def test_is_allowed_lower(self):
+        """is_allowed_lower matches pre-lowercased names."""
+        filter = VaultFilter("AI,Dev")
+        assert filter.is_allowed_lower("ai")
+        assert filter.is_allowed_lower("dev")
+        assert not filter.is_allowed_lower("personal")
+
     def test_filter_vaults(self):
         """filter_vaults only returns allowed vaults."""
         filter = VaultFilter("AI,Dev")
@@ -100,6 +113,28 @@ class TestFieldRedactor:
         assert result["fields"][0]["value"] == "user"
         assert result["fields"][1]["value"] == "[REDACTED]"
 
+    def test_redact_item_does_not_modify_input(self):
+        """redact_item leaves the original item and fields untouched."""
+        redactor = FieldRedactor()
+        fields = [{"id": "password", "field_type": "CONCEALED", "value": "pass"}]
+        item = {"id": "item1", "fields": fields}
+
+        result = redactor.redact_item(item)
+
+        assert result is not item
+        assert result["fields"] is not fields
+        assert item["fields"][0]["value"] == "pass"
+
+    def test_redact_item_shares_unredacted_fields(self):
+        """Fields that need no redaction are not copied."""
+        redactor = FieldRedactor()
+        username = {"id": "username", "field_type": "TEXT", "value": "user"}
+        item = {"id": "item1", "fields": [username]}
+
+        result = redactor.redact_item(item)
+
+        assert result["fields"][0] is username
+
 
 class TestRateLimiter:
     """Tests for RateLimiter."""
@@ -133,3 +168,59 @@ class TestRateLimiter:
         await limiter.acquire()
         elapsed = time.monotonic() - start
         assert elapsed < 0.05  # Should be nearly instant
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_are_spaced(self):
+        """Concurrent callers each wait for their own slot."""
+        limiter = RateLimiter(min_delay_seconds=0.1)
+        start = time.monotonic()
+        finished = []
+
+        async def call():
+            await limiter.acquire()
+            finished.append(time.monotonic() - start)
+
+        await asyncio.gather(call(), call(), call())
+
+        assert finished[0] < 0.05
+        assert finished[1] >= 0.09
+        assert finished[2] >= 0.19
+
+    @pytest.mark.asyncio
+    async def test_capacity_allows_burst(self):
+        """Calls up to capacity proceed immediately, then are spaced."""
+        limiter = RateLimiter(min_delay_seconds=0.1, capacity=2)
+        start = time.monotonic()
+        finished = []
+
+        async def call():
+            await limiter.acquire()
+            finished.append(time.monotonic() - start)
+
+        await asyncio.gather(call(), call(), call())
+
+        assert finished[0] < 0.05
+        assert finished[1] < 0.05
+        assert finished[2] >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_frees_its_slot(self):
+        """A call cancelled while waiting doesn't delay the next one."""
+        limiter = RateLimiter(min_delay_seconds=0.2)
+        await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        start = time.monotonic()
+        await limiter.acquire()
+        elapsed = time.monotonic() - start
+        assert elapsed < 0.25  # One slot, not two
+
+    def test_capacity_must_be_positive(self):
+        """A bucket must hold at least one token."""
+        with pytest.raises(ValueError):
+            RateLimiter(capacity=0)
@@ -0,0 +1,37 @@
+"""Tests for the MCP server's tool handlers."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from onepassword_mcp import server
+
+
+class TestResolveSecret:
+    """Tests for op_resolve_secret."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_secret_cache(self):
+        """Build the secret cache from each test's environment."""
+        server.get_secret_cache.cache_clear()
+        yield
+        server.get_secret_cache.cache_clear()
+
+    @pytest.mark.asyncio
+    async def test_invalid_cache_ttl_disables_cache(self, monkeypatch):
+        """A non-numeric OP_SECRET_CACHE_TTL is ignored rather than failing resolves."""
+        monkeypatch.setenv("OP_SECRET_CACHE_TTL", "five minutes")
+        client = MagicMock()
+        client.resolve_secret = AsyncMock(return_value="s3cret")
+        limiter = MagicMock()
+        limiter.acquire = AsyncMock()
+
+        with patch.object(server, "get_client", return_value=client), \
+                patch.object(server, "get_rate_limiter", return_value=limiter):
+            for _ in range(2):
+                result = await server.handle_resolve_secret(
+                    {"secret_reference": "op://AI/item/password"}
+                )
+                assert result[0].text == "s3cret"
+
+        assert server.get_secret_cache().ttl == 0
+        assert client.resolve_secret.await_count == 2